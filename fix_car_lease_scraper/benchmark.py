@@ -0,0 +1,245 @@
+"""
+Parse benchmark
+---------------
+Measures the detail extraction on a frozen corpus of car pages taken from the
+HTTP cache, and reports the extracted fields next to the timings, so parser
+and selector changes can be judged on speed and output together.
+
+Usage:
+    python -m fix_car_lease_scraper.benchmark freeze --count 50
+    python -m fix_car_lease_scraper.benchmark run --repeat 5 --backend lxml
+    python -m fix_car_lease_scraper.benchmark run --save-golden
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:
+    # Unix only, peak_rss_mb() uses psutil on Windows
+    resource = None
+from fix_car_lease_scraper.discovery.listing import normalize_car_url
+from fix_car_lease_scraper.processors.extraction import extract_lease_offer
+from fix_car_lease_scraper.processors.parsers import BACKENDS, get_backend
+from fix_car_lease_scraper.utils.httpcache import DEFAULT_HTTPCACHE_DIR, iter_cached_responses
+
+# Default location of the frozen corpus
+DEFAULT_CORPUS_DIR = 'benchmarks/corpus'
+
+# Fields of the extracted items compared against the golden output
+FIELDS = (
+    'make', 'model', 'version', 'monthly_price', 'lease_duration_months',
+    'yearly_kilometers', 'delivery_time', 'promotion_tags', 'image_urls',
+)
+
+def freeze_corpus(corpus_dir: str = DEFAULT_CORPUS_DIR, cache_dir: str = DEFAULT_HTTPCACHE_DIR,
+                  count: int = 50) -> int:
+    """
+    Copy a representative set of cached car pages into the corpus.
+
+    Pages are picked round-robin over the makes, so every make is covered
+    before any make gets a second page.
+
+    Args:
+        corpus_dir: Directory of the corpus
+        cache_dir: The HTTPCACHE_DIR
+        count: Number of pages to freeze
+
+    Returns:
+        The number of pages frozen
+    """
+    by_make = {}
+    seen_urls = set()
+    for cached in iter_cached_responses(cache_dir):
+        url = normalize_car_url(cached.url)
+        if url is None or url in seen_urls:
+            continue
+        seen_urls.add(url)
+        by_make.setdefault(url.split('/')[-2], []).append(cached)
+
+    selected = []
+    while len(selected) < count and any(by_make.values()):
+        for make in sorted(by_make):
+            if by_make[make] and len(selected) < count:
+                selected.append(by_make[make].pop(0))
+
+    os.makedirs(corpus_dir, exist_ok=True)
+    manifest = []
+    for cached in selected:
+        name = f"{hashlib.sha1(cached.url.encode('utf-8')).hexdigest()}.html.gz"
+        with gzip.open(os.path.join(corpus_dir, name), 'wb') as f:
+            f.write(cached.body)
+        manifest.append({'file': name, 'url': cached.url, 'encoding': cached.encoding})
+
+    with open(os.path.join(corpus_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return len(manifest)
+
+def load_corpus(corpus_dir: str = DEFAULT_CORPUS_DIR) -> List[Dict[str, Any]]:
+    """Load the frozen pages, each with url, encoding and body."""
+    with open(os.path.join(corpus_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    pages = []
+    for entry in manifest:
+        with gzip.open(os.path.join(corpus_dir, entry['file']), 'rb') as f:
+            pages.append(dict(entry, body=f.read()))
+    return pages
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process in MB, 0.0 if it cannot be measured."""
+    if resource is None:
+        try:
+            import psutil
+        except ImportError:
+            return 0.0
+        # The peak working set is Windows' peak RSS
+        memory = psutil.Process().memory_info()
+        return getattr(memory, 'peak_wset', memory.rss) / (1024 * 1024)
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in KB elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def field_report(items: Dict[str, Optional[Dict[str, Any]]],
+                 golden: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Count per field how often it was extracted and how often it matches the golden output.
+
+    Args:
+        items: Extracted item per URL (None for pages that were skipped)
+        golden: Golden item per URL
+
+    Returns:
+        A dict per field with filled, and with golden output also matches and changed
+    """
+    report = {}
+    for field in FIELDS:
+        stats = {'filled': 0}
+        if golden is not None:
+            stats.update(matches=0, changed=0)
+        for url, item in items.items():
+            value = item.get(field) if item else None
+            if value:
+                stats['filled'] += 1
+            if golden is not None and url in golden:
+                expected = golden[url].get(field) if golden[url] else None
+                stats['matches' if value == expected else 'changed'] += 1
+        report[field] = stats
+    return report
+
+def run_benchmark(pages: List[Dict[str, Any]], backend: str = 'lxml', repeat: int = 5) -> Dict[str, Any]:
+    """
+    Time the detail extraction on the corpus.
+
+    One untimed warm-up pass is followed by the timed passes, then one pass
+    under tracemalloc measures the allocations per page.
+
+    Args:
+        pages: Corpus pages from load_corpus
+        backend: Parser backend
+        repeat: Timed passes over the corpus
+
+    Returns:
+        Latency percentiles, throughput, allocations, peak RSS and the items per URL
+    """
+    parser = get_backend(backend)
+
+    def extract(page):
+        return extract_lease_offer(page['body'], page['url'], page['encoding'], parser=parser)
+
+    items = {page['url']: extract(page) for page in pages}
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            page_started = time.perf_counter()
+            extract(page)
+            latencies.append(time.perf_counter() - page_started)
+    elapsed = time.perf_counter() - started
+
+    allocations = []
+    tracemalloc.start()
+    for page in pages:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        extract(page)
+        allocations.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    return {
+        'backend': backend,
+        'pages': len(latencies),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'pages_per_s': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'alloc_peak_kb_p50': round(percentile(allocations, 50) / 1024, 1),
+        'alloc_peak_kb_max': round(max(allocations, default=0) / 1024, 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'items': items,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse throughput benchmark over a frozen page corpus")
+    parser.add_argument('--corpus-dir', default=DEFAULT_CORPUS_DIR, help="Directory of the corpus")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    freeze = commands.add_parser('freeze', help="Freeze cached car pages into the corpus")
+    freeze.add_argument('--cache-dir', default=DEFAULT_HTTPCACHE_DIR, help="Scrapy HTTP cache directory")
+    freeze.add_argument('--count', type=int, default=50, help="Number of pages to freeze")
+
+    run = commands.add_parser('run', help="Benchmark the extraction on the corpus")
+    run.add_argument('--backend', default='lxml', choices=list(BACKENDS), help="Parser backend")
+    run.add_argument('--repeat', type=int, default=5, help="Timed passes over the corpus")
+    run.add_argument('--save-golden', action='store_true', help="Save this run's items as the golden output")
+    args = parser.parse_args()
+
+    if args.command == 'freeze':
+        frozen = freeze_corpus(args.corpus_dir, args.cache_dir, args.count)
+        print(f"Froze {frozen} pages into {args.corpus_dir}")
+        return
+
+    golden_path = os.path.join(args.corpus_dir, 'golden.json')
+    golden = None
+    if os.path.exists(golden_path) and not args.save_golden:
+        with open(golden_path, 'r', encoding='utf-8') as f:
+            golden = json.load(f)
+
+    result = run_benchmark(load_corpus(args.corpus_dir), args.backend, args.repeat)
+    items = result.pop('items')
+
+    print(f"Backend {result['backend']}: {result['pages']} pages, {result['pages_per_s']} pages/s")
+    print(f"Latency p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms")
+    print(f"Allocation peak per page p50 {result['alloc_peak_kb_p50']} KB, "
+          f"max {result['alloc_peak_kb_max']} KB; peak RSS {result['peak_rss_mb']} MB")
+
+    print(f"\n{'field':24} " + ' '.join(f'{key:>8}' for key in ('filled', 'matches', 'changed')))
+    for field, stats in field_report(items, golden).items():
+        print(f"{field:24} " + ' '.join(f"{stats.get(key, '-'):>8}" for key in ('filled', 'matches', 'changed')))
+
+    if args.save_golden:
+        with open(golden_path, 'w', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False, indent=2)
+        print(f"\nSaved golden output to {golden_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, quote_plus, urlsplit, urlunsplit
+from fix_car_lease_scraper.discovery.cards import extract_listing_cards
+from fix_car_lease_scraper.discovery.listing import PAGE_SIZE
+
+# Query parameters the listing API pages with, by role
+OFFSET_PARAMS = ('offset', 'start', 'from', 'skip', 'begin', 'beginbij')
+PAGE_PARAMS = ('page', 'pagenumber', 'pageindex', 'p')
+LIMIT_PARAMS = ('limit', 'size', 'pagesize', 'rows', 'count', 'take', 'perpage')
+
+# Keys holding the total number of results in a listing payload
+TOTAL_KEYS = ('total', 'totalcount', 'totalresults', 'totalitems', 'numfound', 'resultcount', 'nbhits')
+
+def _param_role(name: str) -> Optional[str]:
+    """Get the paging role of a query parameter, None for other parameters."""
+    key = name.lower().replace('_', '').replace('-', '')
+    if key in OFFSET_PARAMS:
+        return 'offset'
+    if key in PAGE_PARAMS:
+        return 'page'
+    if key in LIMIT_PARAMS:
+        return 'limit'
+    return None
+
+def endpoint_template(url: str) -> str:
+    """
+    Turn a captured listing API request into a URL template.
+
+    The paging parameters get placeholders: {offset}, {limit}, and {page0}
+    or {page1} for zero- or one-based page numbers (one-based unless the
+    captured request asked for page 0). All other parameters (filters,
+    sorting, API keys) are kept as they were.
+
+    Args:
+        url: URL of a listing API request captured from the browser
+
+    Returns:
+        The template, e.g. "https://.../search?offset={offset}&limit={limit}"
+    """
+    parts = urlsplit(url)
+    query = []
+    for name, value in parse_qsl(parts.query, keep_blank_values=True):
+        role = _param_role(name)
+        if role == 'page':
+            placeholder = '{page0}' if value == '0' else '{page1}'
+        elif role is not None:
+            placeholder = '{' + role + '}'
+        else:
+            # Braces in other values are percent-encoded, so only the placeholders get formatted
+            placeholder = quote_plus(value)
+        query.append(f'{quote_plus(name)}={placeholder}')
+
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, '&'.join(query), ''))
+
+def is_paged(template: str) -> bool:
+    """Check whether a template pages through the results."""
+    return any(placeholder in template for placeholder in ('{offset}', '{page0}', '{page1}'))
+
+def api_page_url(template: str, offset: int = 0, limit: int = PAGE_SIZE) -> str:
+    """
+    Build the URL of one page of the listing API.
+
+    Args:
+        template: Template from endpoint_template() or the LISTING_API_URL setting
+        offset: Index of the first car of the page, a multiple of limit
+        limit: Cars per page
+
+    Returns:
+        The page URL
+    """
+    return template.format(offset=offset, limit=limit, page0=offset // limit, page1=offset // limit + 1)
+
+def extract_api_total(payload: Any) -> Optional[int]:
+    """
+    Find the total number of results in a listing payload.
+
+    The payload is searched breadth-first, so the top-level total wins over
+    counts nested in the cards.
+
+    Args:
+        payload: Decoded JSON listing response
+
+    Returns:
+        The total, or None if the payload has none
+    """
+    queue = [payload]
+    while queue:
+        node = queue.pop(0)
+        if isinstance(node, list):
+            queue.extend(node)
+        elif isinstance(node, dict):
+            for key, value in node.items():
+                if key.lower().replace('_', '') in TOTAL_KEYS and isinstance(value, int) \
+                        and not isinstance(value, bool):
+                    return value
+            queue.extend(value for value in node.values() if isinstance(value, (dict, list)))
+    return None
+
+def api_fingerprint(payload: Any) -> Dict[str, Any]:
+    """
+    Build a cheap fingerprint of the listing from the first listing API page.
+
+    Like listing_fingerprint() for the HTML listing: the total plus the car
+    URLs of the first page.
+
+    Args:
+        payload: Decoded JSON of the first API page, None if it was not JSON
+
+    Returns:
+        A dict with the total and the first page of car URLs
+    """
+    cards = extract_listing_cards(payload) if payload is not None else []
+    return {
+        'total': extract_api_total(payload),
+        'first_page': list(dict.fromkeys(card['product_url'] for card in cards))[:PAGE_SIZE],
+    }
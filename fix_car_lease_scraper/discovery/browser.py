@@ -0,0 +1,180 @@
+import atexit
+import json
+import os
+import weakref
+from typing import List, Optional
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from fix_car_lease_scraper.discovery.network import enable_network_capture
+from fix_car_lease_scraper.discovery.profile import apply_lean_options
+from fix_car_lease_scraper.discovery.resolver import resolve_chromedriver
+from fix_car_lease_scraper.utils.helpers import is_process_alive, kill_process_tree, process_tree_pids
+
+# Registry of running driver sessions, used to reap orphans after a crash
+DEFAULT_REGISTRY_DIR = '.driver_registry'
+
+# Command name fragment of chromedriver and Chrome/Chromium processes
+CHROME_PROCESS_NAMES = ('chrom',)
+
+# Sessions that have not been quit yet, quit by one exit handler
+_live_sessions = weakref.WeakSet()
+
+def _quit_live_sessions() -> None:
+    """Quit the sessions still running when the process exits."""
+    for session in list(_live_sessions):
+        session.quit()
+
+atexit.register(_quit_live_sessions)
+
+def build_chrome_options(headless: bool = False, capture_network: bool = False,
+                         lean: bool = False, allowed_domains: Optional[List[str]] = None) -> Options:
+    """
+    Build the Chrome options used for Selenium discovery.
+
+    Args:
+        headless: Run Chrome without a visible window
+        capture_network: Enable the performance log for network capture
+        lean: Use the lean production profile (headless, no images or media)
+        allowed_domains: Domains the lean profile may connect to
+
+    Returns:
+        The Chrome options
+    """
+    chrome_options = Options()
+    if headless or lean:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+
+    if lean:
+        apply_lean_options(chrome_options, allowed_domains)
+
+    # The lean profile reads the performance log to report its traffic
+    if capture_network or lean:
+        enable_network_capture(chrome_options)
+
+    return chrome_options
+
+def build_attach_options(debugger_address: str, capture_network: bool = False) -> Options:
+    """
+    Build Chrome options that attach to an already running browser.
+
+    Args:
+        debugger_address: "host:port" of the browser's remote debugging endpoint
+        capture_network: Enable the performance log for network capture
+
+    Returns:
+        The Chrome options
+    """
+    chrome_options = Options()
+    chrome_options.debugger_address = debugger_address
+
+    if capture_network:
+        enable_network_capture(chrome_options)
+
+    return chrome_options
+
+def create_chrome_driver(chrome_options: Options, driver_path: Optional[str] = None) -> webdriver.Chrome:
+    """
+    Start a Chrome driver.
+
+    Args:
+        chrome_options: Options from build_chrome_options
+        driver_path: Chromedriver to use, resolved offline with resolve_chromedriver if not given
+
+    Returns:
+        The running Chrome WebDriver
+    """
+    driver_path = driver_path or resolve_chromedriver()
+    return webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+
+class DriverSession:
+    """
+    Owns one Chrome driver, independently of the spider that uses it.
+
+    The pids of chromedriver and the browser it started are recorded in a
+    registry directory, so processes left behind by a crashed run can be
+    reaped by the next one with reap_orphaned_drivers().
+    """
+    def __init__(self, chrome_options: Options, driver_path: Optional[str] = None,
+                 registry_dir: str = DEFAULT_REGISTRY_DIR):
+        self.registry_dir = registry_dir
+        self.driver = create_chrome_driver(chrome_options, driver_path)
+        self.driver_pid = getattr(getattr(self.driver.service, 'process', None), 'pid', None)
+        self.registry_path = None
+        self._register()
+        # Also clean up when the process exits without quitting the session
+        _live_sessions.add(self)
+
+    def _register(self) -> None:
+        """Record this session's processes in the registry."""
+        if self.driver_pid is None:
+            return
+
+        os.makedirs(self.registry_dir, exist_ok=True)
+        self.registry_path = os.path.join(self.registry_dir, f'{self.driver_pid}.json')
+        with open(self.registry_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'owner_pid': os.getpid(),
+                'pids': process_tree_pids(self.driver_pid),
+            }, f)
+
+    def quit(self) -> None:
+        """Quit the driver and kill whatever is left of its process tree."""
+        if self.driver is None:
+            return
+        _live_sessions.discard(self)
+
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.driver = None
+
+        if self.driver_pid is not None:
+            kill_process_tree(self.driver_pid, CHROME_PROCESS_NAMES)
+        if self.registry_path and os.path.exists(self.registry_path):
+            os.remove(self.registry_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.quit()
+
+def reap_orphaned_drivers(registry_dir: str = DEFAULT_REGISTRY_DIR) -> int:
+    """
+    Kill chromedriver/Chrome processes left behind by runs that have died.
+
+    Args:
+        registry_dir: Registry directory written by DriverSession
+
+    Returns:
+        The number of processes killed
+    """
+    killed = 0
+    try:
+        entries = os.listdir(registry_dir)
+    except OSError:
+        return 0
+
+    for entry in entries:
+        path = os.path.join(registry_dir, entry)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            continue
+
+        # Sessions of a process that is still running are not orphaned
+        if is_process_alive(record.get('owner_pid', -1)):
+            continue
+
+        for pid in record.get('pids', []):
+            killed += kill_process_tree(pid, CHROME_PROCESS_NAMES)
+        os.remove(path)
+
+    return killed
@@ -0,0 +1,79 @@
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+# Default location of the discovery cache
+DEFAULT_CACHE_PATH = '.discovery_cache.json'
+
+class DiscoveryCache:
+    """
+    Stores the last discovered car URL set with the listing fingerprint it was
+    discovered under, so later runs can skip discovery while it is still valid.
+    Only complete discoveries, which reached the listing's results count,
+    are saved.
+
+    A cached set is reused when it is younger than the TTL, or when a cheap
+    probe of the listing (results count plus first page of cards) still
+    matches its fingerprint.
+    """
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = 6 * 3600):
+        self.path = path
+        self.ttl = ttl
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the cached discovery result.
+
+        Returns:
+            A dict with created, car_urls and fingerprint, or None if there is no usable cache
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(cached, dict) or not cached.get('car_urls'):
+            return None
+        return cached
+
+    def save(self, car_urls: List[str], fingerprint: Optional[Dict[str, Any]]) -> None:
+        """
+        Save a discovery result.
+
+        Args:
+            car_urls: Discovered car URLs
+            fingerprint: Listing fingerprint from listing_fingerprint()
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created': time.time(),
+                'car_urls': car_urls,
+                'fingerprint': fingerprint,
+            }, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def age(self, cached: Dict[str, Any]) -> float:
+        """Age of a cached result in seconds."""
+        return time.time() - cached.get('created', 0)
+
+    def is_fresh(self, cached: Dict[str, Any]) -> bool:
+        """Check whether a cached result is younger than the TTL."""
+        return self.age(cached) < self.ttl
+
+    def matches(self, cached: Dict[str, Any], fingerprint: Optional[Dict[str, Any]]) -> bool:
+        """
+        Check whether a probe fingerprint matches the cached one.
+
+        A probe that found neither a total nor any cards says nothing about
+        the listing, so it never matches.
+        """
+        if not fingerprint or (not fingerprint.get('total') and not fingerprint.get('first_page')):
+            return False
+        return cached.get('fingerprint') == fingerprint
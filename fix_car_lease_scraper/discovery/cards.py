@@ -0,0 +1,71 @@
+from typing import Any, Dict, List
+from fix_car_lease_scraper.discovery.listing import normalize_car_url
+from fix_car_lease_scraper.processors.transformers import to_int, to_price
+
+# Key fragments used to recognise card fields in listing payloads
+PRICE_KEYS = ('monthlyprice', 'price', 'prijs', 'amount')
+DURATION_KEYS = ('duration', 'months', 'looptijd', 'term')
+KILOMETER_KEYS = ('mileage', 'kilometer', 'km')
+
+def _find_value(card: Dict[str, Any], keys, convert) -> Any:
+    """
+    Find the first field of a card whose key contains one of the given fragments.
+
+    Nested objects like {"price": {"amount": 329}} are searched one level deep.
+    """
+    for key, value in card.items():
+        if not any(fragment in key.lower() for fragment in keys):
+            continue
+        if isinstance(value, dict):
+            for nested in value.values():
+                converted = convert(nested)
+                if converted:
+                    return converted
+            continue
+        converted = convert(value)
+        if converted:
+            return converted
+    return None
+
+def extract_listing_cards(payload: Any) -> List[Dict[str, Any]]:
+    """
+    Extract car cards from a structured listing payload.
+
+    Any object with a string field pointing to a car detail page is treated as
+    a card, its price, duration and kilometer fields are picked up by key name.
+
+    Args:
+        payload: Decoded JSON listing response
+
+    Returns:
+        A list of card dicts with product_url and the card-level lease data found
+    """
+    cards = []
+    stack = [payload]
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+
+        product_url = None
+        for value in node.values():
+            if isinstance(value, str):
+                product_url = normalize_car_url(value)
+                if product_url:
+                    break
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+
+        if product_url:
+            cards.append({
+                'product_url': product_url,
+                'monthly_price': _find_value(node, PRICE_KEYS, to_price),
+                'lease_duration_months': _find_value(node, DURATION_KEYS, to_int),
+                'yearly_kilometers': _find_value(node, KILOMETER_KEYS, to_int),
+            })
+
+    return cards
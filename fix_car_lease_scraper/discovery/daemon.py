@@ -0,0 +1,209 @@
+"""
+Warm browser daemon
+-------------------
+Keeps one Chrome running with a persistent profile (HTTP cache, cookies) and
+remote debugging enabled, so scheduled spider runs attach to it instead of
+cold-starting a browser. Chrome is recycled after a number of pages or when
+its memory use grows past a limit.
+
+Usage:
+    python -m fix_car_lease_scraper.discovery.daemon --port 9222
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import subprocess
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+from fix_car_lease_scraper.discovery.listing import listing_page_url
+from fix_car_lease_scraper.discovery.resolver import find_chrome_binary
+from fix_car_lease_scraper.utils.helpers import process_tree_rss_mb
+
+# State file shared by the daemon and the spiders attaching to it
+DEFAULT_STATE_PATH = '.browser_daemon.json'
+
+def read_state(state_path: str = DEFAULT_STATE_PATH) -> Dict[str, Any]:
+    """Read the daemon state file, empty if it does not exist."""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_state(state: Dict[str, Any], state_path: str = DEFAULT_STATE_PATH) -> None:
+    """Atomically write the daemon state file."""
+    tmp_path = f'{state_path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, state_path)
+
+def daemon_address(state_path: str = DEFAULT_STATE_PATH, timeout: float = 1.0) -> Optional[str]:
+    """
+    Find the debugger address of a running daemon browser.
+
+    Args:
+        state_path: Path of the daemon state file
+        timeout: Socket connect timeout in seconds
+
+    Returns:
+        The "host:port" address to attach to, or None if no daemon is reachable
+    """
+    address = read_state(state_path).get('address')
+    if not address:
+        return None
+
+    host, port = address.rsplit(':', 1)
+    try:
+        with socket.create_connection((host, int(port)), timeout=timeout):
+            return address
+    except (OSError, ValueError):
+        return None
+
+def record_pages(pages: int, state_path: str = DEFAULT_STATE_PATH) -> None:
+    """
+    Add the pages a spider loaded in the daemon browser to its page count.
+
+    Args:
+        pages: Number of page loads and "Load More" clicks
+        state_path: Path of the daemon state file
+    """
+    state = read_state(state_path)
+    if state:
+        state['pages'] = state.get('pages', 0) + pages
+        write_state(state, state_path)
+
+class BrowserDaemon:
+    """
+    Runs a warm Chrome for spiders to attach to and recycles it when needed.
+    """
+    def __init__(self, port: int = 9222, profile_dir: str = '.browser_profile',
+                 state_path: str = DEFAULT_STATE_PATH, max_pages: int = 500,
+                 max_memory_mb: float = 1500, check_interval: float = 30,
+                 chrome_binary: Optional[str] = None, headless: bool = True,
+                 warm_url: Optional[str] = None):
+        self.port = port
+        self.profile_dir = os.path.abspath(profile_dir)
+        self.state_path = state_path
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.check_interval = check_interval
+        self.chrome_binary = chrome_binary or find_chrome_binary()
+        self.headless = headless
+        self.warm_url = warm_url or listing_page_url(0)
+        self.process = None
+
+    def start_browser(self) -> None:
+        """Start Chrome on the persistent profile and load the warm-up page."""
+        if not self.chrome_binary:
+            raise RuntimeError("No Chrome executable found, pass --chrome-binary")
+
+        args = [
+            self.chrome_binary,
+            f'--remote-debugging-port={self.port}',
+            f'--user-data-dir={self.profile_dir}',
+            '--no-first-run',
+            '--no-default-browser-check',
+            '--window-size=1920,1080',
+            '--disable-gpu',
+            '--no-sandbox',
+            '--disable-dev-shm-usage',
+        ]
+        if self.headless:
+            args.append('--headless=new')
+        args.append(self.warm_url)
+
+        self.process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        write_state({
+            'pid': self.process.pid,
+            'address': f'127.0.0.1:{self.port}',
+            'pages': 0,
+            'started': datetime.now().isoformat(),
+        }, self.state_path)
+        logging.info(f"Started Chrome (pid {self.process.pid}) on port {self.port}")
+
+    def stop_browser(self) -> None:
+        """Stop Chrome, killing it if it does not exit in time."""
+        if self.process is None:
+            return
+
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+        logging.info(f"Stopped Chrome (pid {self.process.pid})")
+        self.process = None
+
+    def recycle_reason(self) -> Optional[str]:
+        """
+        Check whether Chrome should be recycled.
+
+        Returns:
+            A description of the reason, or None if Chrome can keep running
+        """
+        if self.process is None or self.process.poll() is not None:
+            return "browser exited"
+
+        pages = read_state(self.state_path).get('pages', 0)
+        if pages >= self.max_pages:
+            return f"{pages} pages loaded"
+
+        memory_mb = process_tree_rss_mb(self.process.pid)
+        if memory_mb is not None and memory_mb > self.max_memory_mb:
+            return f"using {memory_mb:.0f} MB"
+
+        return None
+
+    def serve_forever(self) -> None:
+        """Keep Chrome running, recycling it whenever recycle_reason() says so."""
+        self.start_browser()
+        try:
+            while True:
+                time.sleep(self.check_interval)
+                reason = self.recycle_reason()
+                if reason:
+                    logging.info(f"Recycling Chrome: {reason}")
+                    self.stop_browser()
+                    self.start_browser()
+        finally:
+            self.stop_browser()
+            write_state({}, self.state_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm browser daemon for the ANWB lease scraper")
+    parser.add_argument('--port', type=int, default=9222, help="Remote debugging port")
+    parser.add_argument('--profile-dir', default='.browser_profile', help="Persistent Chrome profile directory")
+    parser.add_argument('--state-path', default=DEFAULT_STATE_PATH, help="State file shared with the spider")
+    parser.add_argument('--max-pages', type=int, default=500, help="Recycle Chrome after this many pages")
+    parser.add_argument('--max-memory-mb', type=float, default=1500, help="Recycle Chrome above this memory use")
+    parser.add_argument('--check-interval', type=float, default=30, help="Seconds between health checks")
+    parser.add_argument('--chrome-binary', default=None, help="Path of the Chrome executable")
+    parser.add_argument('--show-window', action='store_true', help="Run Chrome with a visible window")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+    daemon = BrowserDaemon(
+        port=args.port,
+        profile_dir=args.profile_dir,
+        state_path=args.state_path,
+        max_pages=args.max_pages,
+        max_memory_mb=args.max_memory_mb,
+        check_interval=args.check_interval,
+        chrome_binary=args.chrome_binary,
+        headless=not args.show_window
+    )
+    daemon.serve_forever()
+
+if __name__ == "__main__":
+    main()
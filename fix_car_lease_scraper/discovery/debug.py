@@ -0,0 +1,130 @@
+import gzip
+import logging
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+# Debug capture levels
+LEVEL_OFF = 'off'
+LEVEL_PRODUCTION = 'production'
+LEVEL_FULL = 'full'
+LEVELS = (LEVEL_OFF, LEVEL_PRODUCTION, LEVEL_FULL)
+
+class DebugCapture:
+    """
+    Captures screenshots and page sources during Selenium discovery.
+
+    - 'off': nothing is captured
+    - 'production': at most one snapshot per interval is captured, since a
+      screenshot blocks the driver. The last N are kept in memory and only
+      written to disk, as one compressed archive with a snapshot of the
+      failed state, when discovery fails
+    - 'full': every snapshot is written to disk, compressed
+
+    All disk writes happen on a background thread, their errors are logged.
+    """
+    def __init__(self, driver, level: str = LEVEL_PRODUCTION, buffer_size: int = 5,
+                 directory: str = 'debug', logger: Optional[logging.Logger] = None,
+                 interval: float = 30.0):
+        if level not in LEVELS:
+            raise ValueError(f"Unknown debug capture level '{level}', expected one of {LEVELS}")
+
+        self.driver = driver
+        self.level = level
+        self.directory = directory
+        self.logger = logger or logging.getLogger(__name__)
+        # Ring buffer of (name, png bytes, html or None)
+        self.buffer = deque(maxlen=max(1, buffer_size))
+        self.interval = interval
+        self.skipped = 0
+        self._last_capture = None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='debug-writer')
+
+    def snapshot(self, name: str, html: bool = False) -> None:
+        """
+        Capture a screenshot, and optionally the page source, under a name.
+
+        Args:
+            name: Name of the checkpoint, e.g. "after_click_3"
+            html: Also capture the page source
+        """
+        if self.level == LEVEL_OFF:
+            return
+
+        # Production runs only pay for an occasional screenshot
+        now = time.monotonic()
+        if self.level == LEVEL_PRODUCTION and self._last_capture is not None \
+                and now - self._last_capture < self.interval:
+            self.skipped += 1
+            return
+        self._last_capture = now
+
+        try:
+            png = self.driver.get_screenshot_as_png()
+            page_source = self.driver.page_source if html else None
+        except Exception as e:
+            self.logger.warning(f"Could not capture debug snapshot '{name}': {str(e)}")
+            return
+
+        if self.level == LEVEL_FULL:
+            self._submit(self._write_files, name, png, page_source)
+        else:
+            self.buffer.append((name, png, page_source))
+
+    def _submit(self, write, *args) -> None:
+        """Run a write on the background thread and log it if it fails."""
+        def log_failure(future):
+            error = future.exception()
+            if error is not None:
+                self.logger.error(f"Could not write debug snapshots: {str(error)}")
+
+        self._writer.submit(write, *args).add_done_callback(log_failure)
+
+    def _write_files(self, name: str, png: bytes, page_source: Optional[str]) -> None:
+        """Write one snapshot as a PNG and a gzipped HTML file."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, f'{name}.png'), 'wb') as f:
+            f.write(png)
+        if page_source is not None:
+            with gzip.open(os.path.join(self.directory, f'{name}.html.gz'), 'wt', encoding='utf-8') as f:
+                f.write(page_source)
+
+    def _write_archive(self, path: str, snapshots) -> None:
+        """Write buffered snapshots into one compressed zip archive."""
+        os.makedirs(self.directory, exist_ok=True)
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for index, (name, png, page_source) in enumerate(snapshots):
+                archive.writestr(f'{index:02d}_{name}.png', png)
+                if page_source is not None:
+                    archive.writestr(f'{index:02d}_{name}.html', page_source)
+        self.logger.info(f"Saved {len(snapshots)} debug snapshots to {path}")
+
+    def flush(self, reason: str) -> None:
+        """
+        Write the buffered snapshots to disk because discovery failed.
+
+        Args:
+            reason: Short description of the failure, logged with the flush
+        """
+        if self.level == LEVEL_PRODUCTION:
+            # The throttled snapshots may predate the failure, capture its state too
+            self._last_capture = None
+            self.snapshot('failure', html=True)
+
+        if not self.buffer:
+            return
+
+        snapshots = list(self.buffer)
+        self.buffer.clear()
+        path = os.path.join(self.directory, f"discovery_failure_{datetime.now().strftime('%Y%m%d%H%M%S')}.zip")
+        self.logger.warning(f"Discovery failed ({reason}), flushing debug snapshots"
+                            f" ({self.skipped} throttled)")
+        self._submit(self._write_archive, path, snapshots)
+
+    def close(self) -> None:
+        """Wait for pending writes to finish."""
+        self._writer.shutdown(wait=True)
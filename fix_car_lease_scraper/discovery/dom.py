@@ -0,0 +1,95 @@
+import json
+from typing import Any, Dict, List
+from fix_car_lease_scraper.discovery.listing import CAR_PATH, normalize_car_url
+from fix_car_lease_scraper.processors.transformers import clean_price, scan_lease_fields_batch
+
+# XPath of the "Load More" button on the listing
+LOAD_MORE_XPATH = "//button[contains(., 'Laad de volgende')]"
+
+# Selectors tried to locate the "Load More" button itself
+LOAD_MORE_SELECTORS = [
+    "//button[contains(text(), 'Laad de volgende 15 resultaten')]",
+    "//button[contains(@class, 'PONCHO-typography--button-link')]",
+    "//button[@data-test='button-tertiary']",
+]
+
+# Shared prelude: the unique car detail links currently in the DOM
+CAR_LINKS_JS = """
+    const CAR_PATH = new RegExp(%s);
+    const carLinks = new Map();
+    for (const link of document.querySelectorAll('a[href*="/anwb-private-lease/aanbod/"]')) {
+        const href = (link.href || '').split(/[?#]/)[0];
+        if (CAR_PATH.test(href) && !carLinks.has(href)) {
+            carLinks.set(href, link);
+        }
+    }
+""" % json.dumps(CAR_PATH + '/?$')
+
+# Returns the number of car cards shown, cheap enough to poll after every click
+COUNT_CARDS_SCRIPT = CAR_LINKS_JS + """
+    return carLinks.size;
+"""
+
+# Returns all car cards with their metadata as one JSON array
+HARVEST_CARDS_SCRIPT = CAR_LINKS_JS + """
+    const cards = [];
+    for (const [href, link] of carLinks) {
+        const card = link.closest('.PONCHO-card, [data-test="product-card"], .card, article, li');
+        const scope = card || link;
+        const heading = scope.querySelector('h2, h3, h4, [class*="heading"], [class*="title"]');
+        const text = (scope.innerText || '').replace(/\\s+/g, ' ').trim();
+        const price = text.match(/€\\s*\\d+(?:[.,]\\d+)?/);
+        const leaseInfo = text.match(/\\d+\\s*(?:months|maanden)[^€]*?km\\s*\\/\\s*(?:year|jaar)/i);
+        cards.push({
+            href: href,
+            method: card ? 'card' : (heading ? 'heading' : 'link'),
+            title: heading ? heading.innerText.trim() : '',
+            price: price ? price[0].replace(/\\.(?=\\d{3})/g, '') : '',
+            lease_info: leaseInfo ? leaseInfo[0] : ''
+        });
+    }
+    return cards;
+"""
+
+def count_cards(driver) -> int:
+    """
+    Count the car cards currently shown on the listing.
+
+    Args:
+        driver: Selenium WebDriver on the listing page
+
+    Returns:
+        The number of unique car detail links in the DOM
+    """
+    return int(driver.execute_script(COUNT_CARDS_SCRIPT) or 0)
+
+def harvest_cards(driver) -> List[Dict[str, Any]]:
+    """
+    Harvest all car cards on the listing with a single script call.
+
+    Args:
+        driver: Selenium WebDriver on the listing page
+
+    Returns:
+        A list of card dicts with product_url, title, the extraction method
+        ('card', 'heading' or 'link') and the card-level lease data found
+    """
+    cards = []
+    raw_cards = driver.execute_script(HARVEST_CARDS_SCRIPT) or []
+    lease_infos = scan_lease_fields_batch(raw.get('lease_info') for raw in raw_cards)
+
+    for raw, lease_info in zip(raw_cards, lease_infos):
+        product_url = normalize_car_url(raw.get('href'))
+        if not product_url:
+            continue
+
+        cards.append({
+            'product_url': product_url,
+            'title': raw.get('title', ''),
+            'method': raw.get('method', 'link'),
+            'monthly_price': clean_price(raw.get('price')) or None,
+            'lease_duration_months': lease_info['lease_duration_months'],
+            'yearly_kilometers': lease_info['yearly_kilometers'],
+        })
+
+    return cards
@@ -0,0 +1,147 @@
+import re
+from typing import Any, Dict, List, Optional
+
+# Base URL of the private lease listing, the paginated pages hang off it
+LISTING_BASE_URL = "https://www.anwb.nl/auto/private-lease/anwb-private-lease/aanbod"
+
+# Number of cards the listing shows per page / per "Load More" click
+PAGE_SIZE = 15
+
+# <title> of the listing. Unknown make/model paths answer 200 with the
+# listing under this title instead of a 404.
+LISTING_TITLE = "Je privéauto leasen via de ANWB"
+
+# Make or model slug in a car detail path, e.g. "volkswagen" or "id.3-ev"
+CAR_SLUG = r'[a-z0-9][a-z0-9.-]*'
+
+# Path of a car detail page: .../aanbod/<make>/<model>, the single definition
+# shared by the URL normalization, the embedded path search and the in-page scripts
+CAR_PATH = rf'/auto/private-lease/anwb-private-lease/aanbod/({CAR_SLUG})/({CAR_SLUG})'
+
+CAR_URL_PATTERN = re.compile(rf'^(?:https?://www\.anwb\.nl)?{CAR_PATH}/?$')
+
+# Car detail paths embedded anywhere in the page, e.g. in the __NEXT_DATA__ JSON
+EMBEDDED_CAR_PATH_PATTERN = re.compile(rf'{CAR_PATH}(?=["\'?#\\])')
+
+def listing_page_url(offset: int = 0) -> str:
+    """
+    Build the URL of a listing page.
+
+    Args:
+        offset: Index of the first card on the page, a multiple of PAGE_SIZE
+
+    Returns:
+        The listing URL, e.g. ".../aanbod/begin-bij=30/aanbod=new"
+    """
+    if offset <= 0:
+        return f"{LISTING_BASE_URL}/aanbod=new"
+    return f"{LISTING_BASE_URL}/begin-bij={offset}/aanbod=new"
+
+def listing_offsets(total: int, start: int = PAGE_SIZE) -> List[int]:
+    """
+    Compute the offsets of all listing pages after the first one.
+
+    Args:
+        total: Total number of cars reported by the listing
+        start: First offset to include
+
+    Returns:
+        A list of offsets, e.g. [15, 30, 45] for 50 cars
+    """
+    return list(range(start, total, PAGE_SIZE))
+
+def normalize_car_url(href: Optional[str]) -> Optional[str]:
+    """
+    Turn a link into an absolute car detail URL.
+
+    Args:
+        href: Relative or absolute link found on the listing
+
+    Returns:
+        The absolute detail URL, or None if the link is not a car detail page
+    """
+    if not href:
+        return None
+
+    match = CAR_URL_PATTERN.match(href.strip())
+    if not match:
+        return None
+
+    # Pagination and filter links ("begin-bij=15") never match the pattern
+    make, model = match.groups()
+    return f"{LISTING_BASE_URL}/{make}/{model}"
+
+def extract_results_count(text: Optional[str]) -> Optional[int]:
+    """
+    Extract the total number of cars from the results counter text.
+
+    Args:
+        text: Text of the results counter, e.g. "199 resultaten"
+
+    Returns:
+        The number of cars, or None if it could not be found
+    """
+    if not text:
+        return None
+
+    match = re.search(r'(\d+)', text)
+    return int(match.group(1)) if match else None
+
+def extract_car_urls(response) -> List[str]:
+    """
+    Extract all car detail URLs from a listing response.
+
+    Looks at the rendered card links first and then at the car paths in the
+    embedded page data, which is where the listing keeps its cards when they
+    are rendered client side.
+
+    Args:
+        response: Scrapy response of a listing page
+
+    Returns:
+        A list of unique absolute car detail URLs in page order
+    """
+    car_urls = []
+    seen = set()
+
+    candidates = response.css('a[href*="/aanbod/"]::attr(href)').getall()
+    for script in response.css('script#__NEXT_DATA__::text, script[type="application/json"]::text').getall():
+        candidates.extend(match.group() for match in EMBEDDED_CAR_PATH_PATTERN.finditer(script))
+
+    for href in candidates:
+        url = normalize_car_url(href)
+        if url and url not in seen:
+            seen.add(url)
+            car_urls.append(url)
+
+    return car_urls
+
+def extract_total(response) -> Optional[int]:
+    """
+    Extract the total number of cars from a listing response.
+
+    Args:
+        response: Scrapy response of a listing page
+
+    Returns:
+        The number of cars, or None if the results counter was not found
+    """
+    return extract_results_count(' '.join(response.css('[data-test="results-count"] ::text').getall()))
+
+def listing_fingerprint(response) -> Dict[str, Any]:
+    """
+    Build a cheap fingerprint of the listing from its first page.
+
+    The results count plus the car URLs on the first page change whenever
+    cars are added to or removed from the top of the listing.
+
+    Args:
+        response: Scrapy response of the first listing page
+
+    Returns:
+        A dict with the total and the first page of car URLs
+    """
+    return {
+        'total': extract_total(response),
+        'first_page': extract_car_urls(response)[:PAGE_SIZE],
+    }
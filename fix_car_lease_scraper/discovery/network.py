@@ -0,0 +1,116 @@
+import base64
+import json
+from typing import Any, Dict, List, Optional
+from selenium.common.exceptions import WebDriverException
+from fix_car_lease_scraper.discovery.cards import extract_listing_cards
+
+# Resource types of the listing data requests
+CAPTURED_RESOURCE_TYPES = ('XHR', 'Fetch')
+
+def enable_network_capture(chrome_options) -> None:
+    """
+    Enable Chrome's performance log so network events can be read back.
+
+    Args:
+        chrome_options: Selenium Chrome options used to start the driver
+    """
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+def read_performance_log(driver) -> List[Dict[str, Any]]:
+    """
+    Read and decode the DevTools messages logged since the last read.
+
+    The log is consumed by reading it, so every consumer should share the result.
+
+    Args:
+        driver: Selenium Chrome WebDriver with the performance log enabled
+
+    Returns:
+        The DevTools messages, each with a method and params
+    """
+    messages = []
+    for entry in driver.get_log('performance'):
+        try:
+            messages.append(json.loads(entry['message'])['message'])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return messages
+
+class NetworkCapture:
+    """
+    Harvests the listing's XHR/fetch JSON responses from Chrome's performance log.
+    """
+    def __init__(self, driver):
+        self.driver = driver
+        # Cards found so far, keyed by product URL
+        self.cards = {}
+        # Request IDs of JSON responses whose body is not loaded yet
+        self.pending = set()
+        self.payloads_captured = 0
+        # Request URLs of the pending responses, and the first one that carried cards
+        self.request_urls = {}
+        self.endpoint_url = None
+
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+        except WebDriverException:
+            pass
+
+    def _response_body(self, request_id: str) -> Optional[Any]:
+        """Fetch and decode the JSON body of a finished response."""
+        try:
+            body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except WebDriverException:
+            return None
+
+        text = body.get('body', '')
+        if body.get('base64Encoded'):
+            text = base64.b64decode(text).decode('utf-8', errors='replace')
+
+        try:
+            return json.loads(text)
+        except ValueError:
+            return None
+
+    def drain(self, messages: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Process the performance log entries since the last call.
+
+        Args:
+            messages: Messages already read with read_performance_log, read here if not given
+
+        Returns:
+            The cards that were not seen before
+        """
+        new_cards = []
+        if messages is None:
+            messages = read_performance_log(self.driver)
+
+        for message in messages:
+            method = message.get('method')
+            params = message.get('params', {})
+
+            if method == 'Network.responseReceived':
+                mime_type = params.get('response', {}).get('mimeType', '')
+                if params.get('type') in CAPTURED_RESOURCE_TYPES and 'json' in mime_type:
+                    self.pending.add(params.get('requestId'))
+                    self.request_urls[params.get('requestId')] = params.get('response', {}).get('url')
+
+            elif method == 'Network.loadingFinished' and params.get('requestId') in self.pending:
+                self.pending.discard(params['requestId'])
+                request_url = self.request_urls.pop(params['requestId'], None)
+                payload = self._response_body(params['requestId'])
+                if payload is None:
+                    continue
+
+                self.payloads_captured += 1
+                cards = extract_listing_cards(payload)
+                if cards and self.endpoint_url is None:
+                    # The listing API, HTTP discovery can page through it directly
+                    self.endpoint_url = request_url
+                for card in cards:
+                    if card['product_url'] not in self.cards:
+                        self.cards[card['product_url']] = card
+                        new_cards.append(card)
+
+        return new_cards
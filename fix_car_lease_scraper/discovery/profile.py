@@ -0,0 +1,128 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+# URL patterns of heavy resources discovery never needs
+DEFAULT_BLOCKED_RESOURCES = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.m3u8', '*.mp3',
+]
+
+# Analytics, tag managers and other third parties loaded by the listing
+DEFAULT_BLOCKED_DOMAINS = [
+    'googletagmanager.com', 'google-analytics.com', 'doubleclick.net', 'optimizely.com',
+    'blueconic.net', 't066.anwb.nl', 'speedcurve.com', 'sentry.io', 'trustpilot.com',
+    'hotjar.com', 'facebook.net',
+]
+
+# Domains the browser may resolve at all, everything else fails DNS (empty allows all)
+DEFAULT_ALLOWED_DOMAINS = ['anwb.nl', 'bloomreach.cloud']
+
+# Typical size per resource type, used to estimate the bytes saved by blocking
+ESTIMATED_RESOURCE_BYTES = {
+    'Image': 60000,
+    'Media': 500000,
+    'Font': 40000,
+    'Script': 30000,
+    'Stylesheet': 20000,
+}
+DEFAULT_ESTIMATED_BYTES = 10000
+
+def apply_lean_options(chrome_options, allowed_domains: Optional[List[str]] = None) -> None:
+    """
+    Add the launch flags of the lean discovery profile to Chrome options.
+
+    Args:
+        chrome_options: Selenium Chrome options used to start the driver
+        allowed_domains: Domains (and their subdomains) the browser may connect to
+    """
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_argument("--mute-audio")
+    chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+    chrome_options.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': 2,
+    })
+
+    if allowed_domains:
+        exclusions = ', '.join(f'EXCLUDE {domain}, EXCLUDE *.{domain}' for domain in allowed_domains)
+        chrome_options.add_argument(f"--host-resolver-rules=MAP * ~NOTFOUND, {exclusions}")
+
+def blocked_url_patterns(resources: Iterable[str], domains: Iterable[str]) -> List[str]:
+    """
+    Combine resource patterns and blocked domains into CDP URL patterns.
+
+    Args:
+        resources: URL patterns like "*.woff2"
+        domains: Domains whose requests are blocked, including subdomains
+
+    Returns:
+        The patterns for Network.setBlockedURLs
+    """
+    patterns = list(resources)
+    for domain in domains:
+        patterns.append(f'*://{domain}/*')
+        patterns.append(f'*://*.{domain}/*')
+    return patterns
+
+def block_requests(driver, patterns: List[str]) -> None:
+    """
+    Block matching requests in the browser through Chrome DevTools.
+
+    Args:
+        driver: Selenium Chrome WebDriver
+        patterns: URL patterns from blocked_url_patterns
+    """
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+
+class TrafficMeter:
+    """
+    Tallies transferred and blocked requests from Chrome's performance log.
+    """
+    def __init__(self):
+        self.bytes_transferred = 0
+        self.requests_finished = 0
+        # Blocked requests per resource type
+        self.blocked = {}
+        # Resource type of every request seen, keyed by request ID
+        self._types = {}
+
+    def process(self, messages: Iterable[Dict[str, Any]]) -> None:
+        """
+        Process DevTools messages from the performance log.
+
+        Args:
+            messages: Messages as returned by read_performance_log
+        """
+        for message in messages:
+            method = message.get('method')
+            params = message.get('params', {})
+
+            if method == 'Network.requestWillBeSent':
+                self._types[params.get('requestId')] = params.get('type', 'Other')
+
+            elif method == 'Network.loadingFinished':
+                self.requests_finished += 1
+                self.bytes_transferred += int(params.get('encodedDataLength', 0))
+
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                resource_type = params.get('type') or self._types.get(params.get('requestId'), 'Other')
+                self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Summarize the traffic of the run.
+
+        Returns:
+            A dict with the bytes transferred, the blocked requests per type
+            and an estimate of the bytes saved by blocking them
+        """
+        estimated_saved = sum(
+            count * ESTIMATED_RESOURCE_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+            for resource_type, count in self.blocked.items()
+        )
+        return {
+            'requests_finished': self.requests_finished,
+            'bytes_transferred': self.bytes_transferred,
+            'requests_blocked': dict(self.blocked),
+            'estimated_bytes_saved': estimated_saved,
+        }
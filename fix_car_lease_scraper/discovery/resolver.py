@@ -0,0 +1,204 @@
+"""
+Chromedriver resolver
+---------------------
+Finds a chromedriver matching the installed Chrome without network access:
+a pinned path, a driver cached per Chrome major version, or a matching
+chromedriver on PATH. webdriver-manager is only used when downloads are
+explicitly allowed, and its driver is then cached for later runs.
+
+Usage (pre-populate the cache on a machine with network access):
+    python -m fix_car_lease_scraper.discovery.resolver --download
+"""
+
+import argparse
+import os
+import re
+import shutil
+import stat
+import subprocess
+import sys
+from typing import Optional
+
+# Default directory of cached drivers, one subdirectory per Chrome major version
+DEFAULT_CACHE_DIR = '.drivers'
+
+IS_WINDOWS = sys.platform.startswith('win')
+
+# Chrome executables to look for when no binary is given
+CHROME_BINARIES = [
+    'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome',
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+]
+if IS_WINDOWS:
+    CHROME_BINARIES += [
+        os.path.expandvars(rf'%{variable}%\Google\Chrome\Application\chrome.exe')
+        for variable in ('ProgramFiles', 'ProgramFiles(x86)', 'LocalAppData')
+    ]
+
+# Registry keys holding the installed Chrome version on Windows, where
+# "chrome --version" prints nothing and opens a browser window instead
+WINDOWS_VERSION_KEYS = [
+    ('HKEY_CURRENT_USER', r'Software\Google\Chrome\BLBeacon'),
+    ('HKEY_LOCAL_MACHINE', r'Software\Google\Chrome\BLBeacon'),
+    ('HKEY_LOCAL_MACHINE', r'Software\WOW6432Node\Google\Chrome\BLBeacon'),
+    ('HKEY_CURRENT_USER', r'Software\Chromium\BLBeacon'),
+]
+
+VERSION_PATTERN = re.compile(r'(\d+)\.\d+\.\d+(?:\.\d+)?')
+
+DRIVER_NAME = 'chromedriver.exe' if IS_WINDOWS else 'chromedriver'
+
+def _version_output(executable: str) -> Optional[str]:
+    """Run an executable with --version and return the version number it prints."""
+    try:
+        output = subprocess.run(
+            [executable, '--version'], capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    match = VERSION_PATTERN.search(output)
+    return match.group(0) if match else None
+
+def _windows_version(chrome_binary: Optional[str]) -> Optional[str]:
+    """
+    Get the Chrome version on Windows from the registry, else from the
+    version-named directory the installer puts next to chrome.exe.
+    """
+    import winreg
+
+    for hive, key in WINDOWS_VERSION_KEYS:
+        try:
+            with winreg.OpenKey(getattr(winreg, hive), key) as handle:
+                version = winreg.QueryValueEx(handle, 'version')[0]
+        except OSError:
+            continue
+        if VERSION_PATTERN.fullmatch(str(version)):
+            return str(version)
+
+    if chrome_binary:
+        try:
+            entries = os.listdir(os.path.dirname(os.path.abspath(chrome_binary)))
+        except OSError:
+            return None
+        versions = [entry for entry in entries if VERSION_PATTERN.fullmatch(entry)]
+        if versions:
+            return max(versions, key=lambda version: tuple(map(int, version.split('.'))))
+    return None
+
+def find_chrome_binary() -> Optional[str]:
+    """
+    Find the installed Chrome executable.
+
+    Returns:
+        The path of the first Chrome executable found, or None
+    """
+    for candidate in CHROME_BINARIES:
+        path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if path:
+            return path
+    return None
+
+def chrome_version(chrome_binary: Optional[str] = None) -> Optional[str]:
+    """
+    Get the installed Chrome version, e.g. "135.0.7049.84", without network access.
+
+    Args:
+        chrome_binary: Chrome executable, looked up if not given
+
+    Returns:
+        The version, or None if Chrome was not found or its version could not be read
+    """
+    chrome_binary = chrome_binary or find_chrome_binary()
+    if IS_WINDOWS:
+        return _windows_version(chrome_binary)
+    return _version_output(chrome_binary) if chrome_binary else None
+
+def major_version(version: Optional[str]) -> Optional[int]:
+    """Get the major version of a version string like "135.0.7049.84"."""
+    return int(version.split('.')[0]) if version else None
+
+def cached_driver_path(cache_dir: str, major: int) -> str:
+    """Path of the cached chromedriver for a Chrome major version."""
+    return os.path.join(cache_dir, str(major), DRIVER_NAME)
+
+def cache_driver(driver_path: str, cache_dir: str, major: int) -> str:
+    """
+    Copy a chromedriver into the cache.
+
+    Args:
+        driver_path: Path of the chromedriver to cache
+        cache_dir: Cache directory
+        major: Chrome major version the driver belongs to
+
+    Returns:
+        The path of the cached driver
+    """
+    target = cached_driver_path(cache_dir, major)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    shutil.copy2(driver_path, target)
+    os.chmod(target, os.stat(target).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return target
+
+def resolve_chromedriver(pinned_path: Optional[str] = None, cache_dir: str = DEFAULT_CACHE_DIR,
+                         allow_download: bool = False, chrome_binary: Optional[str] = None) -> str:
+    """
+    Resolve the chromedriver to use.
+
+    Args:
+        pinned_path: Explicit chromedriver path, used as is when it exists
+        cache_dir: Directory of cached drivers
+        allow_download: Fall back to webdriver-manager (network access) if nothing matches
+        chrome_binary: Chrome executable, looked up if not given
+
+    Returns:
+        The path of a chromedriver
+
+    Raises:
+        RuntimeError: If no matching chromedriver is available offline and downloads are not allowed
+    """
+    if pinned_path:
+        if not os.path.isfile(pinned_path):
+            raise RuntimeError(f"Pinned chromedriver {pinned_path} does not exist")
+        return pinned_path
+
+    major = major_version(chrome_version(chrome_binary))
+
+    if major is not None:
+        cached = cached_driver_path(cache_dir, major)
+        if os.path.isfile(cached):
+            return cached
+
+        on_path = shutil.which('chromedriver')
+        if on_path and major_version(_version_output(on_path)) == major:
+            return cache_driver(on_path, cache_dir, major)
+
+    if not allow_download:
+        if major is None:
+            raise RuntimeError(
+                "Could not determine the installed Chrome version"
+                f"{' from the registry' if IS_WINDOWS else ' with --version'}, so no cached chromedriver "
+                "can be matched. Set CHROMEDRIVER_PATH, or allow a download with CHROMEDRIVER_ALLOW_DOWNLOAD = True"
+            )
+        raise RuntimeError(
+            f"No chromedriver for Chrome {major} in {cache_dir} or on PATH. "
+            "Set CHROMEDRIVER_PATH, or allow a download with CHROMEDRIVER_ALLOW_DOWNLOAD = True"
+        )
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    downloaded = ChromeDriverManager().install()
+    if major is None:
+        return downloaded
+    return cache_driver(downloaded, cache_dir, major)
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve and cache the chromedriver for the installed Chrome")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="Directory of cached drivers")
+    parser.add_argument('--download', action='store_true', help="Allow downloading with webdriver-manager")
+    args = parser.parse_args()
+
+    print(f"Chrome version: {chrome_version() or 'not found'}")
+    print(f"Chromedriver: {resolve_chromedriver(cache_dir=args.cache_dir, allow_download=args.download)}")
+
+if __name__ == "__main__":
+    main()
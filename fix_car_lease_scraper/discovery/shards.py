@@ -0,0 +1,141 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from selenium.webdriver.common.by import By
+from fix_car_lease_scraper.discovery.dom import LOAD_MORE_XPATH, count_cards, harvest_cards
+from fix_car_lease_scraper.discovery.listing import LISTING_BASE_URL, extract_results_count, listing_page_url
+from fix_car_lease_scraper.discovery.waits import WaitEngine
+from fix_car_lease_scraper.processors.brands import BRAND_SLUGS
+
+# Listing filtered on one make, e.g. ".../aanbod/merk=audi/aanbod=new"
+DEFAULT_SHARD_URL_TEMPLATE = LISTING_BASE_URL + "/merk={shard}/aanbod=new"
+
+# Makes offered on the listing, each one's result set fits in one or two pages
+DEFAULT_SHARDS = list(BRAND_SLUGS)
+
+class ShardedDiscovery:
+    """
+    Discovers car URLs shard by shard (one listing filter each) on a bounded
+    pool of headless browsers, then merges and deduplicates the results.
+    """
+    def __init__(self, driver_factory: Callable[[], Any], shards: Optional[List[str]] = None,
+                 url_template: str = DEFAULT_SHARD_URL_TEMPLATE, pool_size: int = 4,
+                 max_clicks: int = 3, timeouts: Optional[Dict[str, float]] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.driver_factory = driver_factory
+        self.shards = shards or DEFAULT_SHARDS
+        self.url_template = url_template
+        self.pool_size = max(1, pool_size)
+        self.max_clicks = max_clicks
+        self.timeouts = timeouts
+        self.logger = logger or logging.getLogger(__name__)
+
+        # One driver per worker thread, all of them tracked for close()
+        self._local = threading.local()
+        self._drivers = []
+        self._lock = threading.Lock()
+
+    def _waits(self) -> WaitEngine:
+        """Return the wait engine of this worker thread's driver, starting it if needed."""
+        waits = getattr(self._local, 'waits', None)
+        if waits is None:
+            driver = self.driver_factory()
+            with self._lock:
+                self._drivers.append(driver)
+            waits = self._local.waits = WaitEngine(driver, self.timeouts)
+        return waits
+
+    def _results_count(self, waits: WaitEngine) -> Optional[int]:
+        """Read the results counter of the page loaded in the driver."""
+        element = waits.element_present((By.CSS_SELECTOR, '[data-test="results-count"]'), 'results_count')
+        return extract_results_count(element.text) if element else None
+
+    def read_total(self) -> Optional[int]:
+        """Load the unfiltered listing and read its total number of cars."""
+        waits = self._waits()
+        waits.driver.get(listing_page_url(0))
+        waits.page_ready()
+        return self._results_count(waits)
+
+    def run_shard(self, shard: str) -> List[Dict[str, Any]]:
+        """
+        Load one shard and click "Load More" until all of its cards are shown.
+
+        Args:
+            shard: Filter value substituted into the URL template, e.g. a make
+
+        Returns:
+            The harvested cards of the shard
+        """
+        waits = self._waits()
+        driver = waits.driver
+        driver.get(self.url_template.format(shard=shard))
+        waits.page_ready()
+
+        if self._results_count(waits) == 0:
+            return []
+
+        waits.cards_grown(0)
+        for _ in range(self.max_clicks):
+            shown = count_cards(driver)
+            button = waits.clickable((By.XPATH, LOAD_MORE_XPATH))
+            if button is None:
+                break
+            driver.execute_script("arguments[0].click();", button)
+            if not waits.cards_grown(shown):
+                break
+
+        return harvest_cards(driver)
+
+    def discover(self, on_cards: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> Tuple[List[str], Optional[int]]:
+        """
+        Run all shards on the browser pool.
+
+        Args:
+            on_cards: Optional callable that receives each shard's cards as soon as it completes
+
+        Returns:
+            A tuple of (unique car URLs, total reported by the unfiltered listing)
+        """
+        car_urls = []
+        seen = set()
+        total = None
+
+        with ThreadPoolExecutor(max_workers=self.pool_size) as pool:
+            total_future = pool.submit(self.read_total)
+            futures = {pool.submit(self.run_shard, shard): shard for shard in self.shards}
+
+            for future in as_completed(futures):
+                shard = futures[future]
+                try:
+                    cards = future.result()
+                except Exception as e:
+                    self.logger.error(f"Shard '{shard}' failed: {str(e)}")
+                    continue
+
+                new_cards = [card for card in cards if card['product_url'] not in seen]
+                for card in new_cards:
+                    seen.add(card['product_url'])
+                    car_urls.append(card['product_url'])
+
+                self.logger.info(f"Shard '{shard}': {len(cards)} cars, {len(new_cards)} new")
+                if on_cards and new_cards:
+                    on_cards(new_cards)
+
+            try:
+                total = total_future.result()
+            except Exception as e:
+                self.logger.error(f"Error reading the listing total: {str(e)}")
+
+        return car_urls, total
+
+    def close(self) -> None:
+        """Quit all pooled browsers."""
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+# Default location of the strategy cache
+DEFAULT_STRATEGY_PATH = '.discovery_strategy.json'
+
+class StrategyCache:
+    """
+    Remembers which selector or extraction method worked, across runs, so
+    discovery tries the last winner first instead of walking every candidate.
+
+    Strategies are grouped by kind (e.g. "load_more_selector"); for each kind
+    the last winner and a win count per candidate are kept.
+    """
+    def __init__(self, path: str = DEFAULT_STRATEGY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.data = self._load()
+        self.dirty = False
+
+    def _load(self) -> Dict[str, Dict]:
+        """Read the cache file, empty if it does not exist."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def ordered(self, kind: str, candidates: List[str]) -> List[str]:
+        """
+        Order candidates with the last winner first, then by number of wins.
+
+        Args:
+            kind: Strategy kind
+            candidates: Candidates in their default order
+
+        Returns:
+            The candidates in the order to try them
+        """
+        entry = self.data.get(kind, {})
+        last = entry.get('last')
+        wins = entry.get('wins', {})
+        # sorted() is stable, so ties keep the default order
+        return sorted(candidates, key=lambda c: (c != last, -wins.get(c, 0)))
+
+    def last(self, kind: str) -> Optional[str]:
+        """Get the last winner of a strategy kind, None if nothing was recorded."""
+        return self.data.get(kind, {}).get('last')
+
+    def record(self, kind: str, winner: str) -> None:
+        """
+        Record the candidate that succeeded.
+
+        Args:
+            kind: Strategy kind
+            winner: The candidate that worked
+        """
+        with self._lock:
+            entry = self.data.setdefault(kind, {'last': None, 'wins': {}})
+            entry['wins'][winner] = entry['wins'].get(winner, 0) + 1
+            entry['last'] = winner
+            self.dirty = True
+
+    def save(self) -> None:
+        """Write the cache file if anything was recorded."""
+        with self._lock:
+            if not self.dirty:
+                return
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
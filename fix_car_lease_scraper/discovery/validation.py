@@ -0,0 +1,113 @@
+import html
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+import requests
+from fix_car_lease_scraper.discovery.listing import LISTING_TITLE, normalize_car_url
+
+# Bytes read from the top of a page to find its <title>, which sits early in the head
+HEAD_BYTES = 16 * 1024
+
+TITLE_PATTERN = re.compile(rb'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+CHARSET_PATTERN = re.compile(r'charset=([\w-]+)', re.IGNORECASE)
+
+def page_title(response: requests.Response, limit: int = HEAD_BYTES) -> Optional[str]:
+    """
+    Read the <title> of a streamed response without downloading the whole body.
+
+    Args:
+        response: Response of a GET with stream=True
+        limit: Maximum number of (decompressed) bytes to read
+
+    Returns:
+        The title text, or None if it is not in the first limit bytes
+    """
+    head = b''
+    for chunk in response.iter_content(chunk_size=4096):
+        head += chunk
+        match = TITLE_PATTERN.search(head)
+        if match:
+            charset = CHARSET_PATTERN.search(response.headers.get('Content-Type', ''))
+            title = match.group(1).decode(charset.group(1) if charset else 'utf-8', 'replace')
+            return html.unescape(title).strip()
+        if len(head) >= limit:
+            break
+    return None
+
+class GuessValidator:
+    """
+    Checks heuristically guessed car URLs with concurrent GET requests before
+    they are crawled, so guesses that 404, redirect away from a car page or
+    answer 200 with the listing (a soft 404) never become full detail
+    requests. Only the top of each page is read, up to its <title>.
+    """
+    def __init__(self, workers: int = 8, timeout: float = 10, user_agent: Optional[str] = None):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.user_agent = user_agent
+        # Guesses that answered 200 with the listing instead of a car page
+        self.soft_404s = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        """Get the HTTP session of the current worker thread."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            if self.user_agent:
+                session.headers['User-Agent'] = self.user_agent
+            self._local.session = session
+        return session
+
+    def resolves(self, url: str) -> bool:
+        """
+        Check whether a URL resolves to a car detail page.
+
+        Made-up make/model paths answer 200 with the listing, so the status
+        alone proves nothing: a page titled like the listing is rejected.
+
+        Args:
+            url: Guessed car URL
+
+        Returns:
+            True if the URL answers 200 with a car page, without redirecting away from it
+        """
+        session = self._session()
+        try:
+            response = session.get(url, allow_redirects=True, timeout=self.timeout, stream=True)
+            try:
+                if response.status_code != 200 or normalize_car_url(response.url) is None:
+                    return False
+                title = page_title(response)
+            finally:
+                response.close()
+        except requests.RequestException:
+            return False
+
+        if title is not None and title.startswith(LISTING_TITLE):
+            with self._lock:
+                self.soft_404s += 1
+            return False
+        return True
+
+    def validate(self, urls: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Validate guessed URLs concurrently.
+
+        Args:
+            urls: Guessed car URLs
+
+        Returns:
+            A tuple of (URLs that resolve, pruned URLs), both in input order
+        """
+        if not urls:
+            return [], []
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(urls)), thread_name_prefix='guess-check') as pool:
+            results = list(pool.map(self.resolves, urls))
+
+        valid = [url for url, ok in zip(urls, results) if ok]
+        pruned = [url for url, ok in zip(urls, results) if not ok]
+        return valid, pruned
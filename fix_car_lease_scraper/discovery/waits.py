@@ -0,0 +1,145 @@
+import time
+from typing import Any, Dict, Optional
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from fix_car_lease_scraper.discovery.dom import CAR_LINKS_JS
+
+# Resolves as soon as the number of car cards exceeds arguments[0], or false after arguments[1] ms
+CARDS_GROWN_SCRIPT = """
+    const previous = arguments[0];
+    const timeoutMs = arguments[1];
+    const done = arguments[arguments.length - 1];
+    const countCards = () => {
+""" + CAR_LINKS_JS + """
+        return carLinks.size;
+    };
+    if (countCards() > previous) {
+        return done(true);
+    }
+    const observer = new MutationObserver(() => {
+        if (countCards() > previous) {
+            observer.disconnect();
+            done(true);
+        }
+    });
+    observer.observe(document.body, {childList: true, subtree: true});
+    setTimeout(() => { observer.disconnect(); done(false); }, timeoutMs);
+"""
+
+# Resolves once the DOM has not changed for arguments[0] ms, or false after arguments[1] ms
+DOM_QUIET_SCRIPT = """
+    const quietMs = arguments[0];
+    const timeoutMs = arguments[1];
+    const done = arguments[arguments.length - 1];
+    let quietTimer = setTimeout(() => finish(true), quietMs);
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => finish(true), quietMs);
+    });
+    const giveUp = setTimeout(() => finish(false), timeoutMs);
+    function finish(result) {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(giveUp);
+        done(result);
+    }
+    observer.observe(document.body, {childList: true, subtree: true, attributes: true});
+"""
+
+class WaitEngine:
+    """
+    Event-driven waits for Selenium discovery.
+
+    Every wait returns as soon as its condition holds, gives up after the
+    timeout configured for its step and records how long it took.
+    """
+    DEFAULT_TIMEOUTS = {
+        'page_load': 30,
+        'results_count': 10,
+        'scroll': 2,
+        'button': 5,
+        'cards_loaded': 15,
+    }
+
+    def __init__(self, driver, timeouts: Optional[Dict[str, float]] = None,
+                 quiet_ms: int = 300, poll_frequency: float = 0.1):
+        self.driver = driver
+        self.timeouts = dict(self.DEFAULT_TIMEOUTS, **(timeouts or {}))
+        self.quiet_ms = quiet_ms
+        self.poll_frequency = poll_frequency
+        # Timing stats per step: calls, timeouts, total and max seconds
+        self.stats = {}
+
+    def _record(self, step: str, started: float, succeeded: bool) -> None:
+        """Record the duration and outcome of a wait."""
+        elapsed = time.monotonic() - started
+        stats = self.stats.setdefault(step, {'calls': 0, 'timeouts': 0, 'total_s': 0.0, 'max_s': 0.0})
+        stats['calls'] += 1
+        stats['total_s'] += elapsed
+        stats['max_s'] = max(stats['max_s'], elapsed)
+        if not succeeded:
+            stats['timeouts'] += 1
+
+    def _until(self, condition, step: str) -> Any:
+        """Wait for a WebDriverWait condition, returning its value or None on timeout."""
+        started = time.monotonic()
+        try:
+            result = WebDriverWait(self.driver, self.timeouts[step], poll_frequency=self.poll_frequency).until(condition)
+        except TimeoutException:
+            result = None
+        self._record(step, started, result is not None)
+        return result
+
+    def _async_script(self, script: str, step: str, *args) -> bool:
+        """Run an in-page wait script that resolves to true or false."""
+        timeout = self.timeouts[step]
+        started = time.monotonic()
+        try:
+            # The script gives up on its own, the driver timeout only guards against hangs
+            self.driver.set_script_timeout(timeout + 5)
+            result = bool(self.driver.execute_async_script(script, *args, int(timeout * 1000)))
+        except WebDriverException:
+            result = False
+        self._record(step, started, result)
+        return result
+
+    def page_ready(self, step: str = 'page_load') -> bool:
+        """Wait until the document has finished loading."""
+        return self._until(
+            lambda driver: driver.execute_script("return document.readyState") == 'complete' or None,
+            step
+        ) is not None
+
+    def element_present(self, locator, step: str):
+        """Wait until an element matching the locator is present and return it."""
+        return self._until(EC.presence_of_element_located(locator), step)
+
+    def clickable(self, target, step: str = 'button'):
+        """Wait until an element (or a locator) is clickable and return the element."""
+        return self._until(EC.element_to_be_clickable(target), step)
+
+    def cards_grown(self, previous_count: int, step: str = 'cards_loaded') -> bool:
+        """Wait until more than previous_count car cards are shown."""
+        return self._async_script(CARDS_GROWN_SCRIPT, step, previous_count)
+
+    def dom_quiet(self, step: str = 'scroll') -> bool:
+        """Wait until the DOM has stopped changing, e.g. after scrolling."""
+        return self._async_script(DOM_QUIET_SCRIPT, step, self.quiet_ms)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the timing stats.
+
+        Returns:
+            A dict per step with calls, timeouts, average and max seconds
+        """
+        return {
+            step: {
+                'calls': stats['calls'],
+                'timeouts': stats['timeouts'],
+                'avg_s': round(stats['total_s'] / stats['calls'], 3),
+                'max_s': round(stats['max_s'], 3),
+            }
+            for step, stats in self.stats.items()
+        }
@@ -0,0 +1,103 @@
+import gzip
+import re
+import zlib
+from typing import Optional
+from fix_car_lease_scraper.discovery.listing import normalize_car_url
+from fix_car_lease_scraper.processors.parsers import get_backend
+from fix_car_lease_scraper.rendering.pool import missing_detail_content
+
+# Elements whose text is not visible page content
+HIDDEN_TAGS = ('script', 'style', 'noscript', 'template')
+
+CHARSET_PATTERN = re.compile(rb'charset=([\w-]+)', re.IGNORECASE)
+
+def decoded_body(response) -> Optional[bytes]:
+    """
+    Get the body of a response with its Content-Encoding undone.
+
+    This middleware sees responses before HttpCompressionMiddleware has
+    decompressed them, so it decodes the body itself.
+
+    Args:
+        response: A downloaded response
+
+    Returns:
+        The decoded body, or None if an encoding is not supported
+    """
+    body = response.body
+    for encoding in reversed(response.headers.getlist('Content-Encoding')):
+        encoding = encoding.strip().lower()
+        try:
+            if encoding in (b'gzip', b'x-gzip'):
+                body = gzip.decompress(body)
+            elif encoding == b'deflate':
+                try:
+                    body = zlib.decompress(body)
+                except zlib.error:
+                    # Some servers send raw deflate data without the zlib header
+                    body = zlib.decompress(body, -zlib.MAX_WBITS)
+            elif encoding == b'br':
+                import brotli
+                body = brotli.decompress(body)
+            elif encoding != b'identity':
+                return None
+        except Exception:
+            # Corrupt data, or brotli is not installed
+            return None
+    return body
+
+class HybridRenderMiddleware:
+    """
+    Downloader middleware that fetches car detail pages over plain HTTP and
+    only re-fetches them with meta['render'], through the pooled headless
+    browsers of RenderingDownloadHandler, when the page text has no price
+    the extractor can read.
+
+    It sits after the HTTP cache, so a page that needs rendering is cached
+    in its rendered form only.
+    """
+    def __init__(self, settings, stats):
+        self.settings = settings
+        self.stats = stats
+        self.parser = get_backend(settings.get('PARSER_BACKEND', 'lxml'))
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler.settings, crawler.stats)
+
+    def visible_text(self, response) -> Optional[str]:
+        """Get the visible text of an HTML response, None if it is not HTML or cannot be decoded"""
+        content_type = response.headers.get('Content-Type') or b''
+        if b'html' not in content_type.lower():
+            return None
+
+        body = decoded_body(response)
+        if body is None:
+            return None
+
+        charset = CHARSET_PATTERN.search(content_type)
+        page = self.parser.parse(body, charset.group(1).decode('ascii') if charset else 'utf-8')
+        return ' '.join(text for tag, text in page.text_nodes if tag not in HIDDEN_TAGS)
+
+    def needs_rendering(self, request, response):
+        """Check whether a response is a car detail page missing its rendered content"""
+        if not (
+            self.settings.getbool('HYBRID_RENDER_ENABLED', True)
+            and not request.meta.get('render')
+            and response.status == 200
+            and normalize_car_url(request.url) is not None
+        ):
+            return False
+
+        text = self.visible_text(response)
+        return text is not None and missing_detail_content(text)
+
+    def process_response(self, request, response, spider):
+        if not self.needs_rendering(request, response):
+            if not request.meta.get('render'):
+                self.stats.inc_value('hybrid_render/plain_http', spider=spider)
+            return response
+
+        spider.logger.info(f"Detail content missing, rendering {request.url}")
+        self.stats.inc_value('hybrid_render/rendered', spider=spider)
+        return request.replace(meta=dict(request.meta, render=True), dont_filter=True)
@@ -0,0 +1,176 @@
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Car brands on the listing, with the other spellings they appear under.
+# The name is the canonical spelling used in the datasets.
+BRAND_CATALOG = (
+    ("Alfa Romeo", ()),
+    ("Audi", ()),
+    ("BMW", ()),
+    ("BYD", ()),
+    ("Citroën", ()),
+    ("Cupra", ()),
+    ("Dacia", ()),
+    ("Dongfeng", ()),
+    ("DS", ("DS Automobiles",)),
+    ("Fiat", ()),
+    ("Ford", ()),
+    ("Honda", ()),
+    ("Hyundai", ()),
+    ("Jaguar", ()),
+    ("Jeep", ()),
+    ("Kia", ()),
+    ("Lancia", ()),
+    ("Land Rover", ()),
+    ("Leapmotor", ()),
+    ("Lexus", ()),
+    ("Lynk & Co", ("Lynk Co", "Lynk and Co")),
+    ("Mazda", ()),
+    ("Mercedes-Benz", ("Mercedes",)),
+    ("MG", ()),
+    ("Mini", ()),
+    ("Mitsubishi", ()),
+    ("Nissan", ()),
+    ("Opel", ()),
+    ("Peugeot", ()),
+    ("Polestar", ()),
+    ("Porsche", ()),
+    ("Renault", ()),
+    ("Seat", ()),
+    ("Škoda", ()),
+    ("Smart", ()),
+    ("Subaru", ()),
+    ("Suzuki", ()),
+    ("Tesla", ()),
+    ("Toyota", ()),
+    ("Volkswagen", ("VW",)),
+    ("Volvo", ()),
+)
+
+# Words of a make/model text: runs of characters other than whitespace and hyphens
+_TOKEN_PATTERN = re.compile(r'[^\s\-]+')
+
+# Characters dropped from a brand name in its URL slug
+_SLUG_DROP_PATTERN = re.compile(r'[^a-z0-9\s\-]')
+
+def normalize_token(token: str) -> str:
+    """
+    Normalize a word for brand matching: casefolded and without diacritics.
+
+    Args:
+        token: A word like "Škoda"
+
+    Returns:
+        The normalized word, e.g. "skoda"
+    """
+    decomposed = unicodedata.normalize('NFKD', token.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+def brand_slug(name: str) -> str:
+    """
+    Get the listing URL slug of a brand, e.g. "alfa-romeo" or "lynk--co".
+
+    Args:
+        name: Brand name
+
+    Returns:
+        The slug: lowercase without diacritics, spaces become hyphens and
+        other punctuation is dropped
+    """
+    return _SLUG_DROP_PATTERN.sub('', normalize_token(name)).replace(' ', '-')
+
+class BrandIndex:
+    """
+    Longest-prefix lookup of brands at the start of a make/model text.
+
+    Brand names and aliases are split into normalized words once, and kept
+    in a dict by their first word with the longest names first. A lookup
+    then costs one dict access plus a word comparison per brand sharing the
+    first word, instead of a scan over the whole catalog.
+    """
+    def __init__(self, catalog: Iterable[Tuple[str, Iterable[str]]] = BRAND_CATALOG):
+        self.by_first_token: Dict[str, List[Tuple[Tuple[str, ...], str]]] = {}
+
+        for name, aliases in catalog:
+            for spelling in (name, *aliases):
+                tokens = tuple(normalize_token(token) for token in _TOKEN_PATTERN.findall(spelling))
+                self.by_first_token.setdefault(tokens[0], []).append((tokens, name))
+
+        for candidates in self.by_first_token.values():
+            candidates.sort(key=lambda candidate: len(candidate[0]), reverse=True)
+
+    def match(self, text: str) -> Optional[Tuple[str, int]]:
+        """
+        Find the brand a text starts with.
+
+        Args:
+            text: A make/model text like "Land Rover Defender"
+
+        Returns:
+            The canonical brand name and the end of the brand in the text,
+            or None if the text does not start with a known brand
+        """
+        first = _TOKEN_PATTERN.match(text.lstrip())
+        if first is None:
+            return None
+
+        candidates = self.by_first_token.get(normalize_token(first.group()))
+        if not candidates:
+            return None
+
+        words = []
+        for match in _TOKEN_PATTERN.finditer(text):
+            words.append(match)
+            if len(words) == len(candidates[0][0]):
+                break
+
+        for tokens, name in candidates:
+            if len(tokens) <= len(words) and all(
+                normalize_token(words[i].group()) == token for i, token in enumerate(tokens)
+            ):
+                return name, words[len(tokens) - 1].end()
+        return None
+
+    def split(self, text: str) -> Optional[Tuple[str, str]]:
+        """
+        Split a make/model text on a known brand.
+
+        Args:
+            text: A make/model text like "Škoda Elroq 85"
+
+        Returns:
+            A tuple of (canonical make, model), or None if no brand matches
+        """
+        match = self.match(text)
+        if match is None:
+            return None
+        name, end = match
+        return name, text[end:].strip(' -')
+
+# Index over the catalog, built once on import
+BRAND_INDEX = BrandIndex()
+
+# URL slugs of all brands in the catalog, e.g. "mercedes-benz"
+BRAND_SLUGS = tuple(brand_slug(name) for name, _ in BRAND_CATALOG)
+
+# Brand slugs as whole words, with hyphens counted as word characters like in
+# the slugs themselves, so short slugs such as "ds" or "mg" don't match inside
+# "cards" or "img-src". Longest first, so "land-rover" is matched as a whole.
+BRAND_SLUG_PATTERN = re.compile(
+    r'(?<![a-z0-9\-])(' + '|'.join(re.escape(slug) for slug in sorted(BRAND_SLUGS, key=len, reverse=True))
+    + r')(?![a-z0-9\-])'
+)
+
+def find_brand_slugs(text: str) -> List[str]:
+    """
+    Find the brands mentioned in a text by their slugs as whole words.
+
+    Args:
+        text: Lowercase text, e.g. a page source
+
+    Returns:
+        The slugs found, in catalog order
+    """
+    found = set(BRAND_SLUG_PATTERN.findall(text))
+    return [slug for slug in BRAND_SLUGS if slug in found]
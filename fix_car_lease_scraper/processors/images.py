@@ -0,0 +1,106 @@
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Terms of site images that are never car photos
+EXCLUDED_IMAGE_TERMS = (
+    'icon', 'logo', 'banner', 'anwb-fietsverzekeren', 'autoverkoopservice',
+    'wat-je-pech', 'onderweg-app', 'getty', 'campagnepagina', 'homepage',
+    'zonnepanelen', 'energiecontract',
+)
+
+# Terms of car photo views
+VIEW_TERMS = ('front', 'back', 'side', 'interior', 'dash')
+
+# Terms of ANWB's own images that are not excluded outright
+SITE_TERMS = ('anwb-', 'campagne')
+
+# Maximum number of images kept per car
+MAX_IMAGES = 10
+
+# Ranks of the kept images, highest first in the output
+RANK_CAR = 3  # Mentions the make or model
+RANK_VIEW = 2  # Transformed image of a car view (front, side, ...)
+RANK_GENERIC = 1  # Other transformed image, only kept without car images
+
+# All exclusion terms in one alternation, searched once per URL
+EXCLUDED_IMAGE_PATTERN = re.compile('|'.join(map(re.escape, EXCLUDED_IMAGE_TERMS)), re.IGNORECASE)
+
+def _alternation(terms: Iterable[str]) -> str:
+    """Join terms into a regex alternation, longest first."""
+    return '|'.join(re.escape(term) for term in sorted(set(terms), key=len, reverse=True))
+
+# The other kinds of terms, each searched on its own
+VIEW_PATTERN = re.compile(_alternation(VIEW_TERMS), re.IGNORECASE)
+SITE_PATTERN = re.compile(_alternation(SITE_TERMS), re.IGNORECASE)
+TRANSFORM_PATTERN = re.compile('transform', re.IGNORECASE)
+FILE_PATTERN = re.compile(r'\.jpg|\.png', re.IGNORECASE)
+
+class ImageClassifier:
+    """
+    Ranks the image URLs of a detail page by how likely they show the car.
+
+    The make and model terms are compiled into one pattern when the
+    classifier is created. Each kind of term (car, view, site,
+    transformation, file type) is searched separately, so a short model
+    term such as the "t" of "t-cross" cannot consume the start of
+    "transform" and hide it.
+    """
+    def __init__(self, make: str, model: str, limit: int = MAX_IMAGES):
+        model = model.lower()
+        car_terms = [term for term in (make.lower(), model.replace('-', ''), model.split('-')[0]) if term]
+        self.car_pattern = re.compile(_alternation(car_terms), re.IGNORECASE) if car_terms else None
+        self.limit = limit
+
+    def score(self, url: str) -> Optional[int]:
+        """
+        Rank one image URL.
+
+        Args:
+            url: Source of an img element
+
+        Returns:
+            RANK_CAR, RANK_VIEW or RANK_GENERIC, or None if the URL is not a car image
+        """
+        if not url.startswith('http') or EXCLUDED_IMAGE_PATTERN.search(url):
+            return None
+
+        # Must be an image file or transformation
+        transformed = TRANSFORM_PATTERN.search(url) is not None
+        if not transformed and not FILE_PATTERN.search(url):
+            return None
+
+        if self.car_pattern is not None and self.car_pattern.search(url):
+            return RANK_CAR
+        if transformed and VIEW_PATTERN.search(url):
+            return RANK_VIEW
+        if transformed and not SITE_PATTERN.search(url):
+            return RANK_GENERIC
+        return None
+
+    def rank(self, urls: Iterable[str]) -> List[str]:
+        """
+        Select the car images of a page.
+
+        Args:
+            urls: Image sources of the page, in document order
+
+        Returns:
+            The deduplicated car images, best ranked first and in document
+            order within a rank, capped at the classifier's limit. Generic
+            transformed images are dropped when the page has car images.
+        """
+        ranks: Dict[str, int] = {}
+        for url in urls:
+            if url in ranks:
+                continue
+            rank = self.score(url)
+            if rank is not None:
+                ranks[url] = rank
+
+        has_car_images = RANK_CAR in ranks.values()
+        ranked = sorted(
+            (url for url, rank in ranks.items() if not (has_car_images and rank == RANK_GENERIC)),
+            key=lambda url: ranks[url],
+            reverse=True
+        )
+        return ranked[:self.limit]
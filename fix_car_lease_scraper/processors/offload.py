@@ -0,0 +1,55 @@
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, Optional
+from twisted.internet.defer import Deferred
+from fix_car_lease_scraper.processors.extraction import extract_lease_offer, set_default_parser
+
+def _fire(deferred: Deferred, future: Future) -> None:
+    """Fire a Deferred with the outcome of a finished future, on the reactor thread."""
+    try:
+        deferred.callback(future.result())
+    except Exception as e:
+        deferred.errback(e)
+
+class ParsePool:
+    """
+    Runs the detail extraction on a pool of worker processes, so CPU-bound
+    parsing scales across cores while the reactor keeps downloading.
+
+    Workers are spawned rather than forked, as the crawler process runs
+    threads, and each worker creates its parser backend once.
+    """
+    def __init__(self, workers: Optional[int] = None, backend: str = 'lxml'):
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=set_default_parser,
+            initargs=(backend,)
+        )
+
+    def submit(self, body: bytes, url: str, encoding: str = 'utf-8',
+               listing_card: Optional[Dict[str, Any]] = None) -> Deferred:
+        """
+        Extract a lease offer in a worker process.
+
+        Args:
+            body: Body of the detail page
+            url: URL of the detail page
+            encoding: Encoding of the body
+            listing_card: Card-level data captured from the listing
+
+        Returns:
+            A Deferred firing with the item dict (or None) of extract_lease_offer
+        """
+        # Imported here so importing this module does not install the default reactor
+        from twisted.internet import reactor
+        
+        deferred = Deferred()
+        future = self.executor.submit(extract_lease_offer, body, url, encoding, listing_card)
+        future.add_done_callback(lambda f: reactor.callFromThread(_fire, deferred, f))
+        return deferred
+
+    def close(self) -> None:
+        """Stop the workers, dropping extractions that have not started."""
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,195 @@
+"""
+HTML parser backends
+--------------------
+Detail extraction reads a page through a small backend interface: a backend
+parses the response body once and returns a ParsedPage holding everything
+the extractors need (text nodes with their tags, image sources, embedded
+JSON and promotion tags). Backends:
+
+- 'parsel': parsel selectors, CSS translated to XPath on each call
+- 'lxml': raw lxml with precompiled etree.XPath objects
+- 'selectolax': the C-based Lexbor parser working on the body bytes
+  (optional dependency, pip install selectolax)
+
+Usage (compare the backends on the cached pages):
+    python -m fix_car_lease_scraper.processors.parsers --repeat 3
+"""
+
+import argparse
+import time
+from typing import Dict, List, NamedTuple, Tuple
+
+# Classes and data-test value of promotion tag elements
+PROMO_CLASSES = ('promotion-tag', 'discount-tag')
+PROMO_DATA_TEST = 'promotion-tag'
+
+class ParsedPage(NamedTuple):
+    """What the extractors need from a detail page, as plain data."""
+    text_nodes: List[Tuple[str, str]]
+    image_srcs: List[str]
+    promo_texts: List[str]
+
+class ParselBackend:
+    """Parser backend on parsel selectors."""
+    name = 'parsel'
+
+    def parse(self, body: bytes, encoding: str = 'utf-8') -> ParsedPage:
+        from parsel import Selector
+
+        selector = Selector(text=body.decode(encoding, 'replace'))
+        text_nodes = []
+        for text in selector.root.xpath('//text()'):
+            element = text.getparent()
+            # Tail text belongs to the element's parent, like ::text selects it
+            if element is not None and text.is_tail:
+                element = element.getparent()
+            if element is not None:
+                text_nodes.append((element.tag if isinstance(element.tag, str) else '', str(text)))
+
+        return ParsedPage(
+            text_nodes=text_nodes,
+            image_srcs=selector.css('img::attr(src)').getall(),
+            promo_texts=selector.css(
+                '.promotion-tag::text, .discount-tag::text, [data-test="promotion-tag"]::text'
+            ).getall(),
+        )
+
+class LxmlBackend:
+    """Parser backend on raw lxml, with every XPath compiled once."""
+    name = 'lxml'
+
+    def __init__(self):
+        from lxml import etree
+
+        self.text_xpath = etree.XPath('//text()')
+        self.image_xpath = etree.XPath('//img/@src')
+        self.promo_xpath = etree.XPath(
+            '//*[' + ' or '.join(
+                f'contains(concat(" ", normalize-space(@class), " "), " {name} ")' for name in PROMO_CLASSES
+            ) + f' or @data-test="{PROMO_DATA_TEST}"]/text()'
+        )
+
+    def parse(self, body: bytes, encoding: str = 'utf-8') -> ParsedPage:
+        from lxml import html
+
+        root = html.fromstring(body, parser=html.HTMLParser(encoding=encoding))
+        text_nodes = []
+        for text in self.text_xpath(root):
+            element = text.getparent()
+            # Tail text belongs to the element's parent, like ::text selects it
+            if element is not None and text.is_tail:
+                element = element.getparent()
+            if element is not None:
+                text_nodes.append((element.tag if isinstance(element.tag, str) else '', str(text)))
+
+        return ParsedPage(
+            text_nodes=text_nodes,
+            image_srcs=[str(src) for src in self.image_xpath(root)],
+            promo_texts=[str(text) for text in self.promo_xpath(root)],
+        )
+
+class SelectolaxBackend:
+    """Parser backend on selectolax's C-based Lexbor parser."""
+    name = 'selectolax'
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError:
+            raise RuntimeError("The 'selectolax' parser backend needs selectolax: pip install selectolax")
+        self.parser_class = LexborHTMLParser
+
+    def parse(self, body: bytes, encoding: str = 'utf-8') -> ParsedPage:
+        tree = self.parser_class(body)
+        text_nodes = []
+        for node in tree.root.traverse(include_text=True):
+            if node.tag != '-text' or node.parent is None:
+                continue
+            text = node.text_content
+            if text:
+                text_nodes.append((node.parent.tag, text))
+
+        promo_selector = ', '.join([f'.{name}' for name in PROMO_CLASSES] + [f'[data-test="{PROMO_DATA_TEST}"]'])
+        return ParsedPage(
+            text_nodes=text_nodes,
+            image_srcs=[node.attributes['src'] for node in tree.css('img') if node.attributes.get('src')],
+            promo_texts=[text for text in (node.text(deep=False) for node in tree.css(promo_selector)) if text],
+        )
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (ParselBackend, LxmlBackend, SelectolaxBackend)
+}
+
+def get_backend(name: str = 'lxml'):
+    """
+    Create a parser backend.
+
+    Args:
+        name: 'parsel', 'lxml' or 'selectolax'
+
+    Returns:
+        The backend
+
+    Raises:
+        ValueError: If the backend is unknown
+        RuntimeError: If the backend's parser is not installed
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown parser backend '{name}', expected one of {tuple(BACKENDS)}")
+    return BACKENDS[name]()
+
+def benchmark(pages: List[Tuple[bytes, str]], backends: List[str], repeat: int = 1) -> Dict[str, Dict[str, float]]:
+    """
+    Time the parser backends on the same pages.
+
+    Args:
+        pages: (body, encoding) of each page
+        backends: Names of the backends to compare
+        repeat: Passes over the pages per backend
+
+    Returns:
+        A dict per backend with pages parsed, total seconds and pages per second
+    """
+    results = {}
+    for name in backends:
+        try:
+            backend = get_backend(name)
+        except RuntimeError as e:
+            print(f"Skipping {name}: {str(e)}")
+            continue
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for body, encoding in pages:
+                backend.parse(body, encoding)
+        elapsed = time.perf_counter() - started
+
+        parsed = len(pages) * repeat
+        results[name] = {
+            'pages': parsed,
+            'total_s': round(elapsed, 3),
+            'pages_per_s': round(parsed / elapsed, 1) if elapsed else 0.0,
+        }
+    return results
+
+def main():
+    from fix_car_lease_scraper.utils.httpcache import DEFAULT_HTTPCACHE_DIR, iter_cached_responses
+
+    parser = argparse.ArgumentParser(description="Compare the HTML parser backends on the cached pages")
+    parser.add_argument('--cache-dir', default=DEFAULT_HTTPCACHE_DIR, help="Scrapy HTTP cache directory")
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), help="Backends to compare")
+    parser.add_argument('--repeat', type=int, default=1, help="Passes over the cached pages")
+    args = parser.parse_args()
+
+    pages = [(cached.body, cached.encoding) for cached in iter_cached_responses(args.cache_dir)]
+    if not pages:
+        print(f"No cached pages found in {args.cache_dir}")
+        return
+
+    print(f"Parsing {len(pages)} cached pages x {args.repeat}")
+    for name, result in benchmark(pages, args.backends, args.repeat).items():
+        print(f"{name:12} {result['pages_per_s']:>8} pages/s  ({result['total_s']}s for {result['pages']} pages)")
+
+if __name__ == "__main__":
+    main()
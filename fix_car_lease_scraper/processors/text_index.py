@@ -0,0 +1,106 @@
+import re
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Pattern, Union
+from fix_car_lease_scraper.processors.parsers import ParsedPage
+
+class TextNode(NamedTuple):
+    """A text node of a page with the tag of the element that contains it."""
+    tag: str
+    text: str
+    lower: str
+
+class TextIndex:
+    """
+    All text nodes of a page, collected in a single DOM traversal by a parser
+    backend (see parsers.py).
+
+    Field extractors query this index instead of running a CSS selector (and
+    so a full DOM walk) per field, and the lowercased text of every node is
+    computed only once.
+    """
+    def __init__(self, page: ParsedPage, page_text: str = ''):
+        self.nodes: List[TextNode] = []
+        self.by_tag: Dict[str, List[TextNode]] = {}
+
+        for tag, text in page.text_nodes:
+            node = TextNode(tag, text, text.lower())
+            self.nodes.append(node)
+            self.by_tag.setdefault(tag, []).append(node)
+
+        self.page_text = page_text
+        self._page_lower = None
+
+    @property
+    def page_lower(self) -> str:
+        """The full page text, lowercased once."""
+        if self._page_lower is None:
+            self._page_lower = self.page_text.lower()
+        return self._page_lower
+
+    def texts(self, tags: Optional[Iterable[str]] = None) -> List[TextNode]:
+        """
+        Get the text nodes of some tags, in document order.
+
+        Args:
+            tags: Tags of the containing elements, all nodes if None
+
+        Returns:
+            The matching text nodes
+        """
+        if tags is None:
+            return self.nodes
+
+        tags = tuple(tags)
+        if len(tags) == 1:
+            return self.by_tag.get(tags[0], [])
+        return [node for node in self.nodes if node.tag in tags]
+
+    def first(self, predicate: Callable[[TextNode], bool],
+              tags: Optional[Iterable[str]] = None) -> Optional[TextNode]:
+        """
+        Find the first text node matching a predicate.
+
+        Args:
+            predicate: Called with each text node
+            tags: Tags of the containing elements, all nodes if None
+
+        Returns:
+            The first matching text node, or None
+        """
+        for node in self.texts(tags):
+            if predicate(node):
+                return node
+        return None
+
+    def contains(self, needles: Iterable[str], tags: Optional[Iterable[str]] = None) -> Optional[TextNode]:
+        """
+        Find the first text node whose lowercased text contains one of the needles.
+
+        Args:
+            needles: Lowercase substrings to look for
+            tags: Tags of the containing elements, all nodes if None
+
+        Returns:
+            The first matching text node, or None
+        """
+        needles = tuple(needles)
+        return self.first(lambda node: any(needle in node.lower for needle in needles), tags)
+
+    def re_first(self, pattern: Union[str, Pattern], tags: Optional[Iterable[str]] = None,
+                 lower: bool = False) -> Optional[re.Match]:
+        """
+        Find the first regex match over the text nodes.
+
+        Args:
+            pattern: Regex to search for
+            tags: Tags of the containing elements, all nodes if None
+            lower: Search the lowercased text
+
+        Returns:
+            The first match, or None
+        """
+        search = re.compile(pattern).search
+        for node in self.texts(tags):
+            match = search(node.lower if lower else node.text)
+            if match:
+                return match
+        return None
@@ -1,12 +1,55 @@
 import re
-from typing import Tuple, Optional
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from fix_car_lease_scraper.processors.brands import BRAND_INDEX
+
+# Number with optional thousands/decimal separators, e.g. "329", "5.000", "10,000"
+_NUMBER = r'\d+(?:[\.,]\d+)*'
+
+# Precompiled field patterns, case-insensitive so texts need no lowercasing.
+# Prices take thousands dots and a decimal comma together ("€ 1.099,50"), or
+# a single separator ("€ 329,-", "€ 329.00"). The km units end on a word
+# boundary, so "kWh" or "keer" are not read as kilometers.
+PRICE_PATTERN = re.compile(r'€\s*(?P<price>\d{1,3}(?:\.\d{3})+(?:,\d+)?|\d+(?:[\.,]\d+)?)', re.IGNORECASE)
+MONTHS_PATTERN = re.compile(r'(?P<months>\d+)\s*(?:months|month|maanden|maand)', re.IGNORECASE)
+KM_PER_YEAR_PATTERN = re.compile(rf'\b(?P<km_year>{_NUMBER})\s*(?:km|k)/(?:year|jaar)\b', re.IGNORECASE)
+KM_PATTERN = re.compile(r'\b(?P<km>\d+(?:[\.,]\d+)?)\s*(?:km|k)\b', re.IGNORECASE)
+
+# Combined scanner: one pass over a text finds every field. At a given position
+# the alternatives are tried in order, so "5.000 km/jaar" is read as km per year
+# rather than as a plain km value.
+LEASE_FIELDS_PATTERN = re.compile(
+    '|'.join(pattern.pattern for pattern in (PRICE_PATTERN, MONTHS_PATTERN, KM_PER_YEAR_PATTERN, KM_PATTERN)),
+    re.IGNORECASE
+)
+
+# Joins a batch of texts into one string: not whitespace, so no pattern can
+# match across two texts
+_BATCH_SEPARATOR = '\x00'
+
+# Thousands separators, e.g. the dot in "1.099"
+_THOUSANDS_PATTERN = re.compile(r'\.(?=\d{3}\b)')
+_PRICE_DIGITS_PATTERN = re.compile(r'(\d+)(?:,(\d+))?')
+_NON_DIGITS_PATTERN = re.compile(r'[^\d]')
+
+def parse_number(number_text: str) -> int:
+    """
+    Convert a number with separators like "5.000" or "10,000" to an int.
+
+    Args:
+        number_text: The digits with optional separators
+
+    Returns:
+        The number
+    """
+    return int(_NON_DIGITS_PATTERN.sub('', number_text) or 0)
 
 def clean_price(price_text: Optional[str]) -> float:
     """
     Extract and clean the price from a text string.
     
     Args:
-        price_text: A string containing the price, e.g. "€ 329,-"
+        price_text: A string containing the price, e.g. "€ 329,-" or "€ 1.099,50"
         
     Returns:
         The price as a float, e.g. 329.0
@@ -14,8 +57,8 @@ def clean_price(price_text: Optional[str]) -> float:
     if not price_text:
         return 0.0
     
-    # Extract digits and possible decimal part
-    price_match = re.search(r'(\d+)(?:,(\d+))?', price_text)
+    # Extract digits and possible decimal part, without thousands separators
+    price_match = _PRICE_DIGITS_PATTERN.search(_THOUSANDS_PATTERN.sub('', price_text))
     if not price_match:
         return 0.0
     
@@ -26,6 +69,99 @@ def clean_price(price_text: Optional[str]) -> float:
     # Convert to float
     return float(f"{euros}.{cents}")
 
+def to_int(value: Any) -> Optional[int]:
+    """Convert a payload value like 72, "72" or "5.000 km" to an int."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        return parse_number(value) or None
+    return None
+
+def to_price(value: Any) -> Optional[float]:
+    """Convert a payload value like 329, "329.00" or "€ 329,-" to a float."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        return clean_price(value) or None
+    return None
+
+def _empty_fields() -> Dict[str, Any]:
+    """The result of scanning a text without lease fields."""
+    return {'monthly_price': None, 'lease_duration_months': None,
+            'yearly_kilometers': None, 'kilometers': None}
+
+def _record(fields: Dict[str, Any], match: re.Match) -> None:
+    """Store a match of the combined scanner, unless its field was already found."""
+    kind = match.lastgroup
+    value = match.group(kind)
+    if kind == 'price':
+        if fields['monthly_price'] is None:
+            fields['monthly_price'] = clean_price(value)
+    elif kind == 'months':
+        if fields['lease_duration_months'] is None:
+            fields['lease_duration_months'] = int(value)
+    else:
+        kilometers = parse_number(value)
+        if kind == 'km_year' and fields['yearly_kilometers'] is None:
+            fields['yearly_kilometers'] = kilometers
+        if fields['kilometers'] is None:
+            fields['kilometers'] = kilometers
+
+def scan_lease_fields(text: Optional[str]) -> Dict[str, Any]:
+    """
+    Find the price, duration and kilometers in a text in a single regex pass.
+
+    Args:
+        text: A text like "€ 329,- per maand, based on 72 months - 5,000 km/year"
+
+    Returns:
+        A dict with the first monthly_price, lease_duration_months,
+        yearly_kilometers (a "km/year" value) and kilometers (any km value,
+        km per year included) found, None for the fields not found
+    """
+    fields = _empty_fields()
+    if not text:
+        return fields
+
+    for match in LEASE_FIELDS_PATTERN.finditer(text):
+        _record(fields, match)
+        if None not in fields.values():
+            break
+
+    return fields
+
+def scan_lease_fields_batch(texts: Iterable[Optional[str]]) -> List[Dict[str, Any]]:
+    """
+    Scan a list of texts, see scan_lease_fields.
+
+    The texts are joined and scanned in a single regex pass, each match is
+    then assigned to the text it was found in. This is much faster than one
+    scan per text when most texts hold no field, like the text nodes of a page.
+
+    Args:
+        texts: The texts to scan
+
+    Returns:
+        The fields found in each text, in the same order
+    """
+    texts = [text or '' for text in texts]
+    results = [_empty_fields() for _ in texts]
+
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + len(_BATCH_SEPARATOR)
+
+    for match in LEASE_FIELDS_PATTERN.finditer(_BATCH_SEPARATOR.join(texts)):
+        _record(results[bisect_right(starts, match.start()) - 1], match)
+
+    return results
+
 def extract_duration_kilometers(lease_info: Optional[str]) -> Tuple[int, int]:
     """
     Extract lease duration and kilometers from the lease info text.
@@ -36,21 +172,11 @@ def extract_duration_kilometers(lease_info: Optional[str]) -> Tuple[int, int]:
     Returns:
         A tuple of (duration_months, yearly_kilometers)
     """
-    if not lease_info:
-        return 60, 10000  # Default values
+    fields = scan_lease_fields(lease_info)
     
-    # Extract duration
-    duration_match = re.search(r'(\d+)\s*(?:months|month|maanden|maand)', lease_info.lower())
-    duration = int(duration_match.group(1)) if duration_match else 60
-    
-    # Extract kilometers
-    km_match = re.search(r'(\d+(?:[\.,]\d+)?)\s*(?:k|km)/(?:year|jaar)', lease_info.lower())
-    
-    if km_match:
-        km_text = km_match.group(1).replace('.', '').replace(',', '')
-        kilometers = int(km_text)
-    else:
-        kilometers = 10000  # Default
+    # Fall back to the default values
+    duration = fields['lease_duration_months'] or 60
+    kilometers = fields['yearly_kilometers'] or 10000
     
     return duration, kilometers
 
@@ -62,26 +188,16 @@ def extract_make_model(make_model_text: Optional[str]) -> Tuple[str, str]:
         make_model_text: A string like "Leapmotor T03"
         
     Returns:
-        A tuple of (make, model)
+        A tuple of (make, model), with the make in its canonical spelling
+        (e.g. "Škoda" for "Skoda Fabia")
     """
     if not make_model_text:
         return "", ""
     
-    # Common car brands to help with splitting
-    common_brands = [
-        "Alfa Romeo", "Audi", "BMW", "Citroën", "Citroen", "Dacia", "Fiat", "Ford", 
-        "Honda", "Hyundai", "Jaguar", "Jeep", "Kia", "Land Rover", "Lexus", "Mazda", 
-        "Mercedes", "Mercedes-Benz", "Mini", "Mitsubishi", "Nissan", "Opel", "Peugeot", 
-        "Porsche", "Renault", "Seat", "Skoda", "Škoda", "Suzuki", "Tesla", "Toyota", 
-        "Volkswagen", "Volvo", "MG", "Leapmotor"
-    ]
-    
-    # Try to find a known brand in the text
-    for brand in common_brands:
-        if make_model_text.lower().startswith(brand.lower()):
-            make = brand
-            model = make_model_text[len(brand):].strip()
-            return make, model
+    # Try to find a known brand at the start of the text
+    brand_split = BRAND_INDEX.split(make_model_text)
+    if brand_split is not None:
+        return brand_split
     
     # Fallback: split on first space
     parts = make_model_text.split(maxsplit=1)
@@ -89,4 +205,24 @@ def extract_make_model(make_model_text: Optional[str]) -> Tuple[str, str]:
         return parts[0], parts[1]
     
     # If all else fails, return the whole text as model and unknown make
-    return "Unknown", make_model_text
\ No newline at end of file
+    return "Unknown", make_model_text
+
+def extract_make_models(make_model_texts: Iterable[Optional[str]]) -> List[Tuple[str, str]]:
+    """
+    Extract make and model from a list of combined texts, e.g. a whole dataset.
+
+    Each distinct text is split only once.
+
+    Args:
+        make_model_texts: Strings like "Leapmotor T03"
+
+    Returns:
+        A (make, model) tuple per text, in the same order
+    """
+    splits = {}
+    results = []
+    for text in make_model_texts:
+        if text not in splits:
+            splits[text] = extract_make_model(text)
+        results.append(splits[text])
+    return results
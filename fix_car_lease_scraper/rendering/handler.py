@@ -0,0 +1,103 @@
+import time
+from scrapy.core.downloader.handlers.http11 import HTTP11DownloadHandler
+from scrapy.http import HtmlResponse
+from twisted.internet import reactor, threads
+from twisted.python.threadpool import ThreadPool
+from fix_car_lease_scraper.discovery.browser import DEFAULT_REGISTRY_DIR, DriverSession, build_chrome_options
+from fix_car_lease_scraper.discovery.profile import (
+    DEFAULT_ALLOWED_DOMAINS, DEFAULT_BLOCKED_DOMAINS, DEFAULT_BLOCKED_RESOURCES,
+    block_requests, blocked_url_patterns
+)
+from fix_car_lease_scraper.discovery.resolver import DEFAULT_CACHE_DIR, resolve_chromedriver
+from fix_car_lease_scraper.rendering.pool import BrowserPool
+
+class RenderingDownloadHandler:
+    """
+    Download handler for http/https that renders requests with meta['render']
+    on a pool of reusable headless browser pages and downloads all other
+    requests with Scrapy's regular HTTP handler.
+
+    Renders run on a dedicated thread pool with one thread per page, so at
+    most RENDER_POOL_SIZE pages render at once and the reactor's own thread
+    pool (used for DNS) is never blocked by renders.
+    """
+    lazy = False
+
+    def __init__(self, settings, crawler=None):
+        self.settings = settings
+        self.crawler = crawler
+        self.http_handler = HTTP11DownloadHandler(settings, crawler)
+        self.chromedriver = None
+
+        size = settings.getint('RENDER_POOL_SIZE', 2)
+        self.pool = BrowserPool(
+            self.create_session,
+            size=size,
+            timeout=settings.getfloat('RENDER_TIMEOUT', 20),
+            max_navigations=settings.getint('RENDER_PAGE_MAX_NAVIGATIONS', 50)
+        )
+        self.threadpool = ThreadPool(minthreads=0, maxthreads=size, name='render-pool')
+        self.threadpool_started = False
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler.settings, crawler)
+
+    def create_session(self):
+        """Start a headless Chrome for the render pool with the discovery profile"""
+        lean = self.settings.getbool('DISCOVERY_LEAN_PROFILE', True)
+        if self.chromedriver is None:
+            self.chromedriver = resolve_chromedriver(
+                pinned_path=self.settings.get('CHROMEDRIVER_PATH'),
+                cache_dir=self.settings.get('CHROMEDRIVER_CACHE_DIR', DEFAULT_CACHE_DIR),
+                allow_download=self.settings.getbool('CHROMEDRIVER_ALLOW_DOWNLOAD', False)
+            )
+
+        session = DriverSession(
+            build_chrome_options(
+                headless=True,
+                lean=lean,
+                allowed_domains=self.settings.getlist('DISCOVERY_ALLOWED_DOMAINS', DEFAULT_ALLOWED_DOMAINS)
+            ),
+            self.chromedriver,
+            self.settings.get('DRIVER_REGISTRY_DIR', DEFAULT_REGISTRY_DIR)
+        )
+        # Heavy resources are always blocked for rendering, the HTML is all that is kept
+        block_requests(session.driver, blocked_url_patterns(
+            self.settings.getlist('DISCOVERY_BLOCKED_RESOURCES', DEFAULT_BLOCKED_RESOURCES),
+            self.settings.getlist('DISCOVERY_BLOCKED_DOMAINS', DEFAULT_BLOCKED_DOMAINS)
+        ))
+        return session
+
+    def download_request(self, request, spider):
+        if not request.meta.get('render'):
+            return self.http_handler.download_request(request, spider)
+
+        if not self.threadpool_started:
+            self.threadpool.start()
+            self.threadpool_started = True
+
+        d = threads.deferToThreadPool(reactor, self.threadpool, self.pool.render, request.url, time.monotonic())
+        d.addCallback(self.build_response, request)
+        return d
+
+    def build_response(self, result, request):
+        """Wrap the rendered HTML in a response"""
+        url, html = result
+        if self.crawler is not None:
+            self.crawler.stats.inc_value('render/pages')
+        return HtmlResponse(url=url, body=html, encoding='utf-8', request=request, flags=['rendered'])
+
+    def close(self):
+        if self.crawler is not None:
+            stats = self.crawler.stats
+            for phase, summary in self.pool.summary().items():
+                for key, value in summary.items():
+                    stats.set_value(f'render/{phase}/{key}', value)
+            stats.set_value('render/pages_recycled', self.pool.pages_recycled)
+            stats.set_value('render/browsers_replaced', self.pool.browsers_replaced)
+
+        if self.threadpool_started:
+            self.threadpool.stop()
+        self.pool.close()
+        return self.http_handler.close()
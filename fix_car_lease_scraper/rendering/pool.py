@@ -0,0 +1,209 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+from fix_car_lease_scraper.discovery.browser import DriverSession
+from fix_car_lease_scraper.processors.transformers import PRICE_PATTERN
+
+# A render is done once the page shows a price. The "gebaseerd op ... maanden"
+# lease terms are not waited for: they are client-side on every page and some
+# pages never show them, which would cost the full RENDER_TIMEOUT.
+DETAIL_CONTENT_SCRIPT = """
+    const text = document.body ? document.body.innerText : '';
+    return /€\\s*\\d/.test(text);
+"""
+
+def missing_detail_content(text: str) -> bool:
+    """
+    Check whether a car detail page lacks content the extractor needs from
+    the server HTML.
+
+    Only the price is checked, with the extractor's own pattern. The lease
+    terms are never in the server HTML, so requiring them would render
+    every page.
+
+    Args:
+        text: Visible text of the detail page (its text nodes, not the markup)
+
+    Returns:
+        True if the price is missing
+    """
+    return not PRICE_PATTERN.search(text)
+
+class PageSlot:
+    """
+    One reusable page of the pool: a browser (the context) and the tab that
+    is navigated for every render, replaced after a number of navigations.
+    """
+    def __init__(self, session: DriverSession):
+        self.session = session
+        self.navigations = 0
+
+    def recycle_page(self) -> None:
+        """Open a fresh tab and close the old one, dropping its accumulated JS heap."""
+        driver = self.session.driver
+        old_handle = driver.current_window_handle
+        driver.switch_to.new_window('tab')
+        new_handle = driver.current_window_handle
+        driver.switch_to.window(old_handle)
+        driver.close()
+        driver.switch_to.window(new_handle)
+        self.navigations = 0
+
+class BrowserPool:
+    """
+    A fixed-size pool of reusable headless Chrome pages for rendering.
+
+    Browsers are started lazily, up to the pool size, and each serves one
+    render at a time, so the pool size is also its concurrency. Pages are
+    recycled after max_navigations renders and a browser that breaks is
+    quit, its place is taken by a new browser on the next render. Renders
+    block, so call render() from a thread.
+    """
+    def __init__(self, session_factory: Callable[[], DriverSession], size: int = 2,
+                 timeout: float = 20, max_navigations: int = 50):
+        self.session_factory = session_factory
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.max_navigations = max(1, max_navigations)
+        self.slots: List[PageSlot] = []
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        # Timing stats per phase: calls, total and max seconds
+        self.stats = {}
+        self.pages_recycled = 0
+        self.browsers_replaced = 0
+
+    def _record(self, phase: str, elapsed: float) -> None:
+        """Record the duration of a phase of a render."""
+        with self._lock:
+            stats = self.stats.setdefault(phase, {'calls': 0, 'total_s': 0.0, 'max_s': 0.0})
+            stats['calls'] += 1
+            stats['total_s'] += elapsed
+            stats['max_s'] = max(stats['max_s'], elapsed)
+
+    def _start(self) -> PageSlot:
+        """Start a browser in a place reserved in self.slots."""
+        try:
+            slot = PageSlot(self.session_factory())
+        except Exception:
+            with self._lock:
+                self.slots.remove(None)
+            # Wake a waiting render, so it can take the place
+            self._idle.put(None)
+            raise
+
+        with self._lock:
+            self.slots[self.slots.index(None)] = slot
+        return slot
+
+    def _acquire(self) -> PageSlot:
+        """
+        Take an idle page, starting a new browser while the pool is not full.
+
+        The idle queue also holds None tokens for places freed by a browser
+        that broke or failed to start, they wake a waiting render to start
+        a browser in that place.
+        """
+        try:
+            slot = self._idle.get_nowait()
+            if slot is not None:
+                return slot
+        except queue.Empty:
+            pass
+
+        while True:
+            with self._lock:
+                start_new = len(self.slots) < self.size
+                if start_new:
+                    # Reserve the place before the slow browser start
+                    self.slots.append(None)
+
+            if start_new:
+                return self._start()
+
+            slot = self._idle.get()
+            if slot is not None:
+                return slot
+
+    def _discard(self, slot: PageSlot) -> None:
+        """Quit the browser of a broken page and free its place in the pool."""
+        try:
+            slot.session.quit()
+        except Exception:
+            pass
+        with self._lock:
+            self.slots.remove(slot)
+            self.browsers_replaced += 1
+
+    def render(self, url: str, queued_at: Optional[float] = None) -> Tuple[str, str]:
+        """
+        Load a page and wait until its detail content has rendered.
+
+        Args:
+            url: URL of the page
+            queued_at: time.monotonic() when the render was requested, to
+                measure how long it waited for a free page
+
+        Returns:
+            A tuple of (final URL, rendered HTML)
+        """
+        slot = self._acquire()
+        started = time.monotonic()
+        if queued_at is not None:
+            self._record('queue_wait', started - queued_at)
+
+        try:
+            if slot.navigations >= self.max_navigations:
+                slot.recycle_page()
+                with self._lock:
+                    self.pages_recycled += 1
+
+            driver = slot.session.driver
+            driver.get(url)
+            slot.navigations += 1
+            try:
+                WebDriverWait(driver, self.timeout).until(
+                    lambda d: d.execute_script(DETAIL_CONTENT_SCRIPT)
+                )
+            except TimeoutException:
+                # Return what has rendered, the spider copes with missing fields
+                pass
+            result = driver.current_url, driver.page_source
+        except WebDriverException:
+            self._discard(slot)
+            # A None token frees the place for a new browser
+            slot = None
+            raise
+        finally:
+            self._record('render', time.monotonic() - started)
+            self._idle.put(slot)
+
+        return result
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the timing stats.
+
+        Returns:
+            A dict per phase (queue_wait, render) with calls, average and max seconds
+        """
+        with self._lock:
+            return {
+                phase: {
+                    'calls': stats['calls'],
+                    'avg_s': round(stats['total_s'] / stats['calls'], 3),
+                    'max_s': round(stats['max_s'], 3),
+                }
+                for phase, stats in self.stats.items()
+            }
+
+    def close(self) -> None:
+        """Quit all browsers of the pool."""
+        with self._lock:
+            for slot in self.slots:
+                if slot is not None:
+                    slot.session.quit()
+            self.slots = []
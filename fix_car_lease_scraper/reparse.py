@@ -0,0 +1,126 @@
+"""
+Offline re-parse
+----------------
+Regenerates the lease offer datasets from Scrapy's HTTP cache, without a
+browser or network: every cached car detail page is run through the detail
+extractor on all cores, and the items are sent through the project's item
+pipelines as in a normal crawl.
+
+Usage:
+    python -m fix_car_lease_scraper.reparse --workers 8
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+import scrapy
+from scrapy.utils.misc import load_object
+from scrapy.utils.project import get_project_settings
+from fix_car_lease_scraper.discovery.listing import normalize_car_url
+from fix_car_lease_scraper.items import LeaseOffer
+from fix_car_lease_scraper.processors.extraction import extract_lease_offer, set_default_parser
+from fix_car_lease_scraper.utils.httpcache import DEFAULT_HTTPCACHE_DIR, cache_entries, read_cached_response
+
+def reparse_entry(entry: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract the lease offer of one cached response.
+
+    Args:
+        entry: Directory of the cache entry
+
+    Returns:
+        The unvalidated item fields, or None if the entry is not a car page
+    """
+    cached = read_cached_response(entry)
+    if cached is None or normalize_car_url(cached.url) is None:
+        return None
+    return extract_lease_offer(cached.body, cached.url, cached.encoding)
+
+def load_pipelines(settings):
+    """Instantiate the ITEM_PIPELINES of the settings, in order."""
+    pipelines = settings.getdict('ITEM_PIPELINES')
+    return [load_object(path)() for path, _ in sorted(pipelines.items(), key=lambda entry: entry[1])]
+
+def reparse(cache_dir: str = DEFAULT_HTTPCACHE_DIR, spider_name: str = 'anwb_lease',
+            workers: Optional[int] = None, settings=None) -> Dict[str, int]:
+    """
+    Re-extract all cached car pages and send the items through the pipelines.
+
+    Args:
+        cache_dir: The HTTPCACHE_DIR
+        spider_name: Spider whose cache to read
+        workers: Worker processes, one per CPU core if not given
+        settings: Scrapy settings, the project settings if not given
+
+    Returns:
+        Counts of entries read, car pages, items and validation failures
+    """
+    settings = settings or get_project_settings()
+    spider = scrapy.Spider(name=spider_name)
+    pipelines = load_pipelines(settings)
+    stats = {'entries': 0, 'car_pages': 0, 'items': 0, 'failed': 0}
+    seen_urls = set()
+
+    for pipeline in pipelines:
+        if hasattr(pipeline, 'open_spider'):
+            pipeline.open_spider(spider)
+
+    entries = list(cache_entries(cache_dir, spider_name))
+    stats['entries'] = len(entries)
+
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=set_default_parser,
+        initargs=(settings.get('PARSER_BACKEND', 'lxml'),)
+    ) as pool:
+        for item in pool.map(reparse_entry, entries, chunksize=16):
+            # Redirects can store the same car page under several requests
+            if item is None or item['product_url'] in seen_urls:
+                continue
+            seen_urls.add(item['product_url'])
+            stats['car_pages'] += 1
+
+            try:
+                item = LeaseOffer(**item).dict()
+            except Exception as e:
+                stats['failed'] += 1
+                spider.logger.warning(f"Validation error for {item['product_url']}: {str(e)}")
+                continue
+
+            for pipeline in pipelines:
+                item = pipeline.process_item(item, spider)
+            stats['items'] += 1
+
+    for pipeline in pipelines:
+        if hasattr(pipeline, 'close_spider'):
+            pipeline.close_spider(spider)
+
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate the datasets from the HTTP cache")
+    parser.add_argument('--cache-dir', default=DEFAULT_HTTPCACHE_DIR, help="Scrapy HTTP cache directory")
+    parser.add_argument('--spider', default='anwb_lease', help="Spider whose cache to read")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: one per core)")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+    started = time.perf_counter()
+    stats = reparse(args.cache_dir, args.spider, args.workers)
+    logging.info(
+        f"Re-parsed {stats['entries']} cache entries in {time.perf_counter() - started:.1f}s: "
+        f"{stats['car_pages']} car pages, {stats['items']} items, {stats['failed']} failed validation"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
 # Scrapy settings for anwb_lease_scraper project
 
+# The lean browser profile's defaults are kept with the profile, in one place
+from fix_car_lease_scraper.discovery.profile import (
+    DEFAULT_ALLOWED_DOMAINS, DEFAULT_BLOCKED_DOMAINS, DEFAULT_BLOCKED_RESOURCES
+)
+
 BOT_NAME = 'fix_car_lease_scraper'
 
 SPIDER_MODULES = ['fix_car_lease_scraper.spiders']
@@ -18,20 +23,116 @@ RANDOMIZE_DOWNLOAD_DELAY = True
 # Enable cookies
 COOKIES_ENABLED = True
 
+# Listing discovery: 'http' requests the paginated listing pages directly,
+# 'selenium' clicks through the "Load More" button in Chrome, 'sharded' splits
+# the listing by make and walks the shards on a pool of headless browsers
+DISCOVERY_MODE = 'http'
+# Fall back to Selenium discovery when the listing pages contain no cars
+DISCOVERY_SELENIUM_FALLBACK = True
+# The listing cards load client-side from a JSON API. HTTP discovery pages
+# through it when its URL is known: LISTING_API_URL, a template with {offset},
+# {limit}, {page0} or {page1} placeholders, else the endpoint Selenium
+# discovery captured from the network log (LISTING_API_LEARN), kept in
+# DISCOVERY_STRATEGY_PATH. Without one the HTML listing pages are used.
+LISTING_API_URL = None
+LISTING_API_PAGE_SIZE = 15
+LISTING_API_LEARN = True
+# Reuse the last discovered car URL set while it is younger than the TTL (in
+# seconds), or while an uncached probe of the first listing API page (the
+# first HTML listing page without an API; results count and first page of
+# cars) still matches the fingerprint it was discovered under
+DISCOVERY_CACHE_ENABLED = True
+DISCOVERY_CACHE_TTL = 6 * 3600
+DISCOVERY_CACHE_PATH = '.discovery_cache.json'
+# Remembers which "Load More" selector and card extraction method worked, so
+# the next runs try them first
+DISCOVERY_STRATEGY_PATH = '.discovery_strategy.json'
+# Check the car URLs guessed from the page text with concurrent GET requests
+# that read up to the page title, and only crawl the ones that resolve to a
+# car page (unknown cars answer 200 with the listing, those are pruned too)
+DISCOVERY_VALIDATE_GUESSES = True
+DISCOVERY_VALIDATION_WORKERS = 8
+DISCOVERY_VALIDATION_TIMEOUT = 10
+# Harvest the listing's XHR/fetch JSON responses through Chrome DevTools
+# during Selenium discovery (URLs plus card-level price, duration and km)
+DISCOVERY_NETWORK_CAPTURE = False
+# Run the Selenium discovery browser without a window
+DISCOVERY_HEADLESS = False
+# Lean production profile for discovery browsers: headless, no images, media
+# or fonts, third-party domains blocked through Chrome DevTools and only the
+# allowed domains resolvable (an empty allow list allows every domain)
+DISCOVERY_LEAN_PROFILE = True
+DISCOVERY_BLOCKED_RESOURCES = DEFAULT_BLOCKED_RESOURCES
+DISCOVERY_BLOCKED_DOMAINS = DEFAULT_BLOCKED_DOMAINS
+DISCOVERY_ALLOWED_DOMAINS = DEFAULT_ALLOWED_DOMAINS
+# Attach Selenium discovery to the warm browser daemon
+# (python -m fix_car_lease_scraper.discovery.daemon) when it is running
+BROWSER_DAEMON_ENABLED = False
+BROWSER_DAEMON_STATE = '.browser_daemon.json'
+# Sharded discovery: number of headless browsers and the listing filters to
+# shard on (empty means all known makes), substituted into the URL template
+DISCOVERY_POOL_SIZE = 4
+DISCOVERY_SHARDS = []
+DISCOVERY_SHARD_URL_TEMPLATE = 'https://www.anwb.nl/auto/private-lease/anwb-private-lease/aanbod/merk={shard}/aanbod=new'
+# Debug screenshots/page sources of Selenium discovery: 'off', 'production'
+# (keep the last DEBUG_CAPTURE_BUFFER snapshots in memory and write them,
+# compressed, only when discovery fails) or 'full' (write every snapshot).
+# In 'production' at most one screenshot is taken per DEBUG_CAPTURE_INTERVAL
+# seconds, as each one blocks the discovery browser
+DEBUG_CAPTURE_LEVEL = 'production'
+DEBUG_CAPTURE_BUFFER = 5
+DEBUG_CAPTURE_INTERVAL = 30
+# Chromedriver resolution: a pinned path, else the driver cached for the
+# installed Chrome major version, else a matching chromedriver on PATH. Only
+# with CHROMEDRIVER_ALLOW_DOWNLOAD is webdriver-manager (network) used.
+CHROMEDRIVER_PATH = None
+CHROMEDRIVER_CACHE_DIR = '.drivers'
+CHROMEDRIVER_ALLOW_DOWNLOAD = False
+
+# Registry of running discovery browsers, used to reap chrome/chromedriver
+# processes left behind by crashed runs
+DRIVER_REGISTRY_DIR = '.driver_registry'
+# Per-step timeouts (seconds) of the event-driven waits in Selenium discovery,
+# each wait returns as soon as its condition holds
+DISCOVERY_WAIT_TIMEOUTS = {
+    'page_load': 30,
+    'results_count': 10,
+    'scroll': 2,
+    'button': 5,
+    'cards_loaded': 15,
+}
+
+# HTML parser backend of the detail extraction: 'parsel', 'lxml' (precompiled
+# XPath) or 'selectolax' (C-based, pip install selectolax)
+PARSER_BACKEND = 'lxml'
+# Run the detail extraction on a pool of worker processes instead of the
+# reactor thread (PARSE_PROCESS_WORKERS = 0 uses one worker per CPU core)
+PARSE_PROCESS_POOL = False
+PARSE_PROCESS_WORKERS = 0
+
 # Set the log level
 LOG_LEVEL = 'INFO'
 
-# Enable and configure the Playwright integration
+# Fetch detail pages over plain HTTP and only re-fetch them through a pool of
+# RENDER_POOL_SIZE headless browser pages when the page text has no price.
+# Ordered after the HTTP cache, so only complete pages get cached.
+DOWNLOADER_MIDDLEWARES = {
+    'fix_car_lease_scraper.middlewares.HybridRenderMiddleware': 950,
+}
+HYBRID_RENDER_ENABLED = True
+# Requests with meta['render'] are rendered on reusable pages, all others are
+# downloaded with Scrapy's regular HTTP handler
 DOWNLOAD_HANDLERS = {
-    "http": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
-    "https": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
+    'http': 'fix_car_lease_scraper.rendering.handler.RenderingDownloadHandler',
+    'https': 'fix_car_lease_scraper.rendering.handler.RenderingDownloadHandler',
 }
+# Pages rendering at once (one browser per page)
+RENDER_POOL_SIZE = 2
+# Seconds to wait for the detail content to render
+RENDER_TIMEOUT = 20
+# Replace a page with a fresh tab after this many navigations
+RENDER_PAGE_MAX_NAVIGATIONS = 50
 TWISTED_REACTOR = 'twisted.internet.asyncioreactor.AsyncioSelectorReactor'
-PLAYWRIGHT_LAUNCH_OPTIONS = {
-    'headless': True,
-    'timeout': 60000,
-}
-PLAYWRIGHT_DEFAULT_NAVIGATION_TIMEOUT = 60000
 
 # Default User-Agent
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -1,17 +1,42 @@
 import scrapy
+from scrapy import signals
+from scrapy.exceptions import DontCloseSpider
+from scrapy.utils.defer import maybe_deferred_to_future
+from twisted.internet import threads
 import json
 import os
 import re
-import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
-from webdriver_manager.chrome import ChromeDriverManager
 from fix_car_lease_scraper.items import LeaseOffer
+from fix_car_lease_scraper.processors.parsers import get_backend
+from fix_car_lease_scraper.processors.brands import find_brand_slugs
+from fix_car_lease_scraper.processors.extraction import extract_lease_offer
+from fix_car_lease_scraper.processors.offload import ParsePool
+from fix_car_lease_scraper.discovery.listing import (
+    PAGE_SIZE, listing_page_url, listing_offsets, extract_car_urls, extract_total, listing_fingerprint
+)
+from fix_car_lease_scraper.discovery.api import (
+    api_fingerprint, api_page_url, endpoint_template, extract_api_total, is_paged
+)
+from fix_car_lease_scraper.discovery.cards import extract_listing_cards
+from fix_car_lease_scraper.discovery.validation import GuessValidator
+from fix_car_lease_scraper.discovery.cache import DEFAULT_CACHE_PATH, DiscoveryCache
+from fix_car_lease_scraper.discovery.network import NetworkCapture, read_performance_log
+from fix_car_lease_scraper.discovery.profile import (
+    DEFAULT_ALLOWED_DOMAINS, DEFAULT_BLOCKED_DOMAINS, DEFAULT_BLOCKED_RESOURCES,
+    TrafficMeter, block_requests, blocked_url_patterns
+)
+from fix_car_lease_scraper.discovery.dom import LOAD_MORE_SELECTORS, LOAD_MORE_XPATH, count_cards, harvest_cards
+from fix_car_lease_scraper.discovery.strategy import DEFAULT_STRATEGY_PATH, StrategyCache
+from fix_car_lease_scraper.discovery.waits import WaitEngine
+from fix_car_lease_scraper.discovery.debug import LEVEL_PRODUCTION, DebugCapture
+from fix_car_lease_scraper.discovery.browser import (
+    DEFAULT_REGISTRY_DIR, DriverSession, build_attach_options, build_chrome_options, reap_orphaned_drivers
+)
+from fix_car_lease_scraper.discovery.resolver import DEFAULT_CACHE_DIR, resolve_chromedriver
+from fix_car_lease_scraper.discovery.daemon import DEFAULT_STATE_PATH, daemon_address, record_pages
+from fix_car_lease_scraper.discovery.shards import DEFAULT_SHARD_URL_TEMPLATE, ShardedDiscovery
 
 class ANWBFullScraper(scrapy.Spider):
     name = 'anwb_lease'
@@ -24,61 +49,279 @@ class ANWBFullScraper(scrapy.Spider):
         'LOG_LEVEL': 'INFO',
     }
     
-    def __init__(self, *args, **kwargs):
+    def __init__(self, discovery=None, *args, **kwargs):
         super(ANWBFullScraper, self).__init__(*args, **kwargs)
         # Create output directories
         os.makedirs("output", exist_ok=True)
         os.makedirs("debug", exist_ok=True)
         
-        # Setup Selenium
-        chrome_options = Options()
-        # Comment out headless mode to see the browser in action
-        # chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
+        # Discovery mode ('http' or 'selenium'), defaults to the DISCOVERY_MODE setting
+        self.discovery = discovery
         
-        # Install and setup Chrome driver
-        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+        # The Selenium driver is only started when browser discovery is used, and
+        # released as soon as discovery is done; its session owns the processes
+        self.driver = None
+        self.driver_session = None
+        self.pool_sessions = []
+        self.resolved_chromedriver = None
+        
+        # Captures listing payloads from Chrome's network log (DISCOVERY_NETWORK_CAPTURE)
+        self.network_capture = None
+        
+        # Card-level data from the listing payloads, keyed by product URL
+        self.listing_cards = {}
+        
+        # Wait engine and debug capture for the Selenium driver, created with it
+        self.waits = None
+        self.debug_capture = None
+        
+        # Tallies the discovery browser's traffic with the lean profile
+        self.traffic_meter = None
+        
+        # Set when the driver is attached to the warm browser daemon
+        self.daemon_attached = False
+        
+        # Page loads and "Load More" clicks done by Selenium discovery
+        self.pages_loaded = 0
         
-        # Get all car URLs using Selenium - with extra effort to get ALL listings
-        self.all_car_urls = self.get_all_car_urls()
-        self.logger.info(f"Found {len(self.all_car_urls)} car URLs")
+        # Car URLs discovered so far, in discovery order
+        self.all_car_urls = []
+        self.seen_car_urls = set()
+        
+        # Total number of cars reported by the listing, once known
+        self.total_cars = None
+        
+        # URL template of the listing's JSON API, once looked up (see listing_api_url)
+        self.api_template = None
+        
+        # HTML parser backend of the detail extraction (PARSER_BACKEND), set from the settings
+        self.parser = None
+        
+        # Process pool running the detail extraction (PARSE_PROCESS_POOL)
+        self.parse_pool = None
+        
+        # Set while Selenium discovery runs in its worker thread
+        self.selenium_discovery_running = False
+        
+        # Discovery cache (DISCOVERY_CACHE_ENABLED), the fingerprint of this run's
+        # listing probe, and whether the URL set came from the cache
+        self.discovery_cache = None
+        self.listing_fingerprint = None
+        self.used_cached_discovery = False
         
         # Stats tracking
         self.stats = {
-            'car_links_found': len(self.all_car_urls),
+            'car_links_found': 0,
+            'listing_pages': 0,
+            'guesses_pruned': 0,
             'cars_processed': 0,
             'successful_extractions': 0,
             'failed_extractions': 0
         }
     
-    def get_all_car_urls(self):
-        """Use Selenium to load the page and click 'Load More' until all cars are shown"""
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super(ANWBFullScraper, cls).from_crawler(crawler, *args, **kwargs)
+        # Keep the spider open while Selenium discovery is still pushing URLs
+        crawler.signals.connect(spider.spider_idle, signal=signals.spider_idle)
+        spider.parser = get_backend(crawler.settings.get('PARSER_BACKEND', 'lxml'))
+        if crawler.settings.getbool('PARSE_PROCESS_POOL', False):
+            spider.parse_pool = ParsePool(
+                workers=crawler.settings.getint('PARSE_PROCESS_WORKERS', 0) or None,
+                backend=crawler.settings.get('PARSER_BACKEND', 'lxml')
+            )
+        return spider
+    
+    def spider_idle(self, spider):
+        """Prevent the spider from closing while discovery is still running"""
+        if self.selenium_discovery_running:
+            raise DontCloseSpider
+    
+    def discovery_chrome_options(self, headless, capture_network=False):
+        """Build Chrome options with the configured discovery profile"""
+        return build_chrome_options(
+            headless=headless,
+            capture_network=capture_network,
+            lean=self.settings.getbool('DISCOVERY_LEAN_PROFILE', True),
+            allowed_domains=self.settings.getlist('DISCOVERY_ALLOWED_DOMAINS', DEFAULT_ALLOWED_DOMAINS)
+        )
+    
+    def apply_request_blocking(self, driver):
+        """Block heavy resources and third-party domains in a lean profile browser"""
+        if not self.settings.getbool('DISCOVERY_LEAN_PROFILE', True):
+            return False
+        
+        block_requests(driver, blocked_url_patterns(
+            self.settings.getlist('DISCOVERY_BLOCKED_RESOURCES', DEFAULT_BLOCKED_RESOURCES),
+            self.settings.getlist('DISCOVERY_BLOCKED_DOMAINS', DEFAULT_BLOCKED_DOMAINS)
+        ))
+        return True
+    
+    def create_pool_driver(self):
+        """Start a headless Chrome driver for the sharded discovery pool"""
+        session = DriverSession(
+            self.discovery_chrome_options(headless=True),
+            self.chromedriver_path(),
+            self.settings.get('DRIVER_REGISTRY_DIR', DEFAULT_REGISTRY_DIR)
+        )
+        self.pool_sessions.append(session)
+        self.apply_request_blocking(session.driver)
+        return session.driver
+    
+    def chromedriver_path(self):
+        """Resolve the chromedriver once per run, offline unless downloads are allowed"""
+        if self.resolved_chromedriver is None:
+            self.resolved_chromedriver = resolve_chromedriver(
+                pinned_path=self.settings.get('CHROMEDRIVER_PATH'),
+                cache_dir=self.settings.get('CHROMEDRIVER_CACHE_DIR', DEFAULT_CACHE_DIR),
+                allow_download=self.settings.getbool('CHROMEDRIVER_ALLOW_DOWNLOAD', False)
+            )
+            self.logger.info(f"Using chromedriver {self.resolved_chromedriver}")
+        return self.resolved_chromedriver
+    
+    def start_driver(self):
+        """Start the Selenium Chrome driver used for browser discovery"""
+        # The browser window is shown unless DISCOVERY_HEADLESS or the lean profile is set
+        # The network log is also read to learn the listing API for HTTP discovery
+        capture_network = self.settings.getbool('DISCOVERY_NETWORK_CAPTURE', False) \
+            or self.settings.getbool('LISTING_API_LEARN', True)
+        lean = self.settings.getbool('DISCOVERY_LEAN_PROFILE', True)
+        chrome_options = self.discovery_chrome_options(
+            headless=self.settings.getbool('DISCOVERY_HEADLESS', False),
+            capture_network=capture_network
+        )
+        
+        # Attach to the warm browser daemon when one is running
+        if self.settings.getbool('BROWSER_DAEMON_ENABLED', False):
+            address = daemon_address(self.settings.get('BROWSER_DAEMON_STATE', DEFAULT_STATE_PATH))
+            if address:
+                self.logger.info(f"Attaching to browser daemon at {address}")
+                chrome_options = build_attach_options(address, capture_network=capture_network or lean)
+                self.daemon_attached = True
+            else:
+                self.logger.warning("Browser daemon is not running, starting a new browser")
+        
+        # Install and setup Chrome driver
+        self.driver_session = DriverSession(
+            chrome_options,
+            self.chromedriver_path(),
+            self.settings.get('DRIVER_REGISTRY_DIR', DEFAULT_REGISTRY_DIR)
+        )
+        self.driver = self.driver_session.driver
+        
+        if capture_network:
+            self.network_capture = NetworkCapture(self.driver)
+        
+        if self.apply_request_blocking(self.driver):
+            self.traffic_meter = TrafficMeter()
+        
+        # Event-driven waits with per-step timeouts (DISCOVERY_WAIT_TIMEOUTS)
+        self.waits = WaitEngine(self.driver, self.settings.getdict('DISCOVERY_WAIT_TIMEOUTS'))
+        
+        # Debug screenshots and page sources, by default only kept when discovery fails
+        self.debug_capture = DebugCapture(
+            self.driver,
+            level=self.settings.get('DEBUG_CAPTURE_LEVEL', LEVEL_PRODUCTION),
+            buffer_size=self.settings.getint('DEBUG_CAPTURE_BUFFER', 5),
+            logger=self.logger,
+            interval=self.settings.getfloat('DEBUG_CAPTURE_INTERVAL', 30.0)
+        )
+    
+    def release_driver(self):
+        """Quit the discovery browsers and reap their processes, discovery no longer needs them"""
+        if self.debug_capture is not None:
+            self.debug_capture.close()
+            self.debug_capture = None
+        
+        if self.driver_session is not None:
+            self.driver_session.quit()
+            self.driver_session = None
+            self.logger.info("Released the discovery browser")
+        
+        for session in self.pool_sessions:
+            session.quit()
+        self.pool_sessions = []
+        
+        self.driver = None
+        self.waits = None
+        self.network_capture = None
+        self.traffic_meter = None
+    
+    def harvest_network_cards(self):
+        """Collect cards from the listing payloads captured since the last call"""
+        if self.network_capture is None and self.traffic_meter is None:
+            return []
+        
+        try:
+            # The performance log is consumed on read, so both consumers share one read
+            messages = read_performance_log(self.driver)
+            if self.traffic_meter is not None:
+                self.traffic_meter.process(messages)
+            if self.network_capture is None:
+                return []
+            return self.network_capture.drain(messages)
+        except Exception as e:
+            self.logger.error(f"Error reading network log: {str(e)}")
+            return []
+    
+    def extract_dom_cards(self, car_urls, on_car_urls=None):
+        """Add the car URLs of every card in the loaded listing, harvested in a single script call"""
+        dom_cards = harvest_cards(self.driver)
+        for card in dom_cards:
+            if card['product_url'] not in car_urls:
+                car_urls.append(card['product_url'])
+        
+        method_counts = {}
+        for card in dom_cards:
+            method_counts[card['method']] = method_counts.get(card['method'], 0) + 1
+        self.logger.info(f"Harvested {len(dom_cards)} car cards {method_counts}")
+        
+        if on_car_urls and dom_cards:
+            on_car_urls(list(car_urls), dom_cards)
+    
+    def extract_network_cards(self, car_urls, on_car_urls=None):
+        """Add the car URLs of the structured listing payloads captured from the network"""
+        if self.network_capture is None:
+            return
+        
+        self.harvest_network_cards()
+        for href in self.network_capture.cards:
+            if href not in car_urls:
+                car_urls.append(href)
+        self.logger.info(f"Captured {len(self.network_capture.cards)} cards from {self.network_capture.payloads_captured} listing payloads")
+    
+    def get_all_car_urls(self, on_car_urls=None):
+        """
+        Use Selenium to load the page and click 'Load More' until all cars are shown.
+        
+        Args:
+            on_car_urls: Optional callable that receives the car URLs visible after every click
+                (and the listing cards captured from the network, if enabled), so they can be
+                crawled while the remaining clicks are still running
+        """
         car_urls = []
         main_url = "https://www.anwb.nl/auto/private-lease/anwb-private-lease/aanbod/aanbod=new"
+        strategy = StrategyCache(self.settings.get('DISCOVERY_STRATEGY_PATH', DEFAULT_STRATEGY_PATH))
         
         try:
             self.logger.info("Starting Selenium browser to get all car URLs...")
             self.driver.get(main_url)
             
             # Wait for the page to load
-            WebDriverWait(self.driver, 30).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
-            )
+            self.waits.page_ready()
             
             # Take a screenshot of the initial page
-            self.driver.save_screenshot("debug/initial_page.png")
+            self.debug_capture.snapshot("initial_page")
             
             # Find out how many cars in total (should be around 199)
             try:
-                # Wait longer for the page to fully load
-                time.sleep(5)
-                total_text = self.driver.find_element(By.CSS_SELECTOR, '[data-test="results-count"]').text
+                # Wait until the results counter is rendered
+                total_element = self.waits.element_present((By.CSS_SELECTOR, '[data-test="results-count"]'), 'results_count')
+                total_text = total_element.text if total_element else ''
                 total_match = re.search(r'(\d+)', total_text)
                 if total_match:
                     total_cars = int(total_match.group(1))
+                    self.total_cars = total_cars
                     self.logger.info(f"Found total of {total_cars} cars to extract")
                 else:
                     total_cars = 199  # Default if we can't extract the number
@@ -105,9 +348,16 @@ class ANWBFullScraper(scrapy.Spider):
             
             while clicks_done < clicks_needed:
                 try:
-                    # Check how many cars are currently shown
-                    car_elements = self.driver.find_elements(By.CSS_SELECTOR, 'a[href*="/auto/private-lease/anwb-private-lease/aanbod/"]')
-                    cars_shown = len([e for e in car_elements if 'aanbod=new' not in e.get_attribute('href')])
+                    # Check how many cars are currently shown - a single script call, not one per link
+                    if on_car_urls:
+                        # Harvest the visible cards and hand them to the crawl right away
+                        dom_cards = harvest_cards(self.driver)
+                        cars_shown = len(dom_cards)
+                        cards = self.harvest_network_cards() + dom_cards
+                        if cards:
+                            on_car_urls([card['product_url'] for card in cards], cards)
+                    else:
+                        cars_shown = count_cards(self.driver)
                     
                     self.logger.info(f"Currently showing {cars_shown} cars after {clicks_done} clicks")
                     
@@ -122,7 +372,8 @@ class ANWBFullScraper(scrapy.Spider):
                     
                     # Scroll to the bottom to make sure the button is visible
                     self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)  # Wait for scrolling to complete
+                    # Wait until the button is clickable again (or give up quickly at the end of the list)
+                    self.waits.clickable((By.XPATH, LOAD_MORE_XPATH))
                     
                     # Find the load more button
                     load_more_button = None
@@ -130,14 +381,8 @@ class ANWBFullScraper(scrapy.Spider):
                     
                     while attempt < max_attempts and not load_more_button:
                         try:
-                            # Try different selector strategies
-                            selectors = [
-                                "//button[contains(text(), 'Laad de volgende 15 resultaten')]",
-                                "//button[contains(@class, 'PONCHO-typography--button-link')]",
-                                "//button[@data-test='button-tertiary']"
-                            ]
-                            
-                            for selector in selectors:
+                            # Try the selector strategies, the one that worked last time first
+                            for selector in strategy.ordered('load_more_selector', LOAD_MORE_SELECTORS):
                                 try:
                                     buttons = self.driver.find_elements(By.XPATH, selector)
                                     for button in buttons:
@@ -148,26 +393,27 @@ class ANWBFullScraper(scrapy.Spider):
                                     continue
                                     
                                 if load_more_button:
+                                    strategy.record('load_more_selector', selector)
                                     break
                             
                             if not load_more_button:
                                 self.logger.warning(f"Button not found on attempt {attempt+1}")
                                 # Try scrolling a bit up and down to find the button
                                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight - 500);")
-                                time.sleep(1)
+                                self.waits.dom_quiet()
                                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                                time.sleep(1)
+                                self.waits.dom_quiet()
                                 attempt += 1
                             
                         except Exception as e:
                             self.logger.error(f"Error finding button: {str(e)}")
                             attempt += 1
-                            time.sleep(1)
+                            self.waits.dom_quiet()
                     
                     if not load_more_button:
                         self.logger.warning("Load More button not found after multiple attempts")
                         # Take a screenshot to see what happened
-                        self.driver.save_screenshot(f"debug/button_not_found_{clicks_done}.png")
+                        self.debug_capture.snapshot(f"button_not_found_{clicks_done}")
                         
                         # Check if we've loaded enough cars already
                         if cars_shown >= total_cars * 0.9:  # If we have at least 90% of the expected cars
@@ -187,7 +433,7 @@ class ANWBFullScraper(scrapy.Spider):
                                         loadMoreButton.click();
                                     }
                                 """)
-                                time.sleep(5)  # Wait longer after JS click
+                                self.waits.cards_grown(cars_shown)
                                 clicks_done += 1
                                 continue
                             except Exception as e:
@@ -197,15 +443,15 @@ class ANWBFullScraper(scrapy.Spider):
                                 else:
                                     # As a last resort, try refreshing the page and starting over
                                     self.driver.refresh()
-                                    time.sleep(5)
+                                    self.waits.page_ready()
                                     continue
                     
                     # Take a screenshot before clicking
-                    self.driver.save_screenshot(f"debug/before_click_{clicks_done+1}.png")
+                    self.debug_capture.snapshot(f"before_click_{clicks_done+1}")
                     
                     # Scroll the button into view
                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", load_more_button)
-                    time.sleep(2)  # Wait for scrolling
+                    self.waits.clickable(load_more_button)
                     
                     # Click the button
                     try:
@@ -215,11 +461,12 @@ class ANWBFullScraper(scrapy.Spider):
                         # If that fails, try JavaScript click
                         self.driver.execute_script("arguments[0].click();", load_more_button)
                     
-                    # Wait for new content to load - longer wait
-                    time.sleep(5)
+                    # Wait for new content to load - returns as soon as new cards appear
+                    if not self.waits.cards_grown(cars_shown):
+                        self.logger.warning("No new cards appeared before the wait timed out")
                     
                     # Take a screenshot after clicking
-                    self.driver.save_screenshot(f"debug/after_click_{clicks_done+1}.png")
+                    self.debug_capture.snapshot(f"after_click_{clicks_done+1}")
                     
                     clicks_done += 1
                     self.logger.info(f"Clicked 'Load More' {clicks_done}/{clicks_needed}")
@@ -227,13 +474,13 @@ class ANWBFullScraper(scrapy.Spider):
                 except StaleElementReferenceException:
                     # If element became stale, the page probably updated
                     self.logger.warning("Stale element - page might have updated")
-                    time.sleep(3)
+                    self.waits.dom_quiet()
                     continue
                     
                 except Exception as e:
                     self.logger.error(f"Error during 'Load More' process: {str(e)}")
                     # Take a screenshot to see what went wrong
-                    self.driver.save_screenshot(f"debug/error_click_{clicks_done+1}.png")
+                    self.debug_capture.snapshot(f"error_click_{clicks_done+1}")
                     
                     # If we've made some progress, continue with what we have
                     if clicks_done >= 3 or cars_shown > 45:  # If we've done a few clicks or have a decent number of cars
@@ -250,7 +497,7 @@ class ANWBFullScraper(scrapy.Spider):
                                     loadMoreButton.click();
                                 }
                             """)
-                            time.sleep(5)
+                            self.waits.cards_grown(cars_shown)
                             clicks_done += 1
                         except:
                             # If all else fails and we haven't made progress, just break
@@ -258,118 +505,31 @@ class ANWBFullScraper(scrapy.Spider):
                                 self.logger.error("Failed to make progress loading cars. Moving on with limited results.")
                             break
             
-            # Take a screenshot of the final page
-            self.driver.save_screenshot("debug/final_page.png")
+            self.pages_loaded += 1 + clicks_done
             
-            # Save the final page HTML
-            with open("debug/final_page.html", "w", encoding="utf-8") as f:
-                f.write(self.driver.page_source)
+            # Capture the final page with its HTML
+            self.debug_capture.snapshot("final_page", html=True)
             
             # Extract all car links from the fully loaded page - VERY thorough approach
             self.logger.info("Extracting all car links from the loaded page...")
 
-            # First, save a screenshot after loading all cars
-            self.driver.save_screenshot("debug/all_cars_loaded.png")
-
-            # Get the page source for local analysis
-            page_source = self.driver.page_source
-            with open("debug/full_page_source.html", "w", encoding="utf-8") as f:
-                f.write(page_source)
-
-            # Method 1: Use more specific CSS selectors that target actual car cards
-            car_urls = []
-            try:
-                # Try to find the actual car cards with more specific selectors
-                car_elements = self.driver.find_elements(By.CSS_SELECTOR, '.PONCHO-card, [data-test="product-card"], .card')
-                
-                self.logger.info(f"Found {len(car_elements)} car card elements")
-                
-                for card in car_elements:
-                    try:
-                        # Find links within each card
-                        links = card.find_elements(By.TAG_NAME, 'a')
-                        for link in links:
-                            href = link.get_attribute('href')
-                            if href and '/auto/private-lease/anwb-private-lease/aanbod/' in href and 'aanbod=new' not in href and 'begin-bij' not in href:
-                                # Make sure it's a car detail page by checking URL structure
-                                parts = href.split('/')
-                                if len(parts) >= 7 and href not in car_urls:
-                                    car_urls.append(href)
-                    except Exception as e:
-                        continue
-            except Exception as e:
-                self.logger.error(f"Error finding car cards: {str(e)}")
-
-            # Method 2: Find all make/model headings and extract their parent links
-            try:
-                car_headings = self.driver.find_elements(By.CSS_SELECTOR, 'h2, h3, h4, [class*="heading"], [class*="title"]')
-                
-                self.logger.info(f"Found {len(car_headings)} potential car headings")
-                
-                for heading in car_headings:
-                    try:
-                        # Try to find parent or ancestor link
-                        parent = heading.find_element(By.XPATH, './ancestor::a')
-                        href = parent.get_attribute('href')
-                        if href and '/auto/private-lease/anwb-private-lease/aanbod/' in href and 'aanbod=new' not in href:
-                            parts = href.split('/')
-                            if len(parts) >= 7 and href not in car_urls:
-                                car_urls.append(href)
-                    except:
-                        # If no parent link, try finding sibling or nearby links
-                        try:
-                            links = heading.find_elements(By.XPATH, './following::a | ./preceding::a | ./parent::*/a')
-                            for link in links[:2]:  # Only check first 2 links to avoid unrelated ones
-                                href = link.get_attribute('href')
-                                if href and '/auto/private-lease/anwb-private-lease/aanbod/' in href and 'aanbod=new' not in href:
-                                    parts = href.split('/')
-                                    if len(parts) >= 7 and href not in car_urls:
-                                        car_urls.append(href)
-                        except:
-                            continue
-            except Exception as e:
-                self.logger.error(f"Error processing headings: {str(e)}")
-
-            # Method 3: Use JavaScript to find links based on URL patterns and element context
-            js_links = self.driver.execute_script("""
-                // This function analyzes the DOM more deeply to find car links
-                function findCarLinks() {
-                    // All links on the page
-                    const allLinks = Array.from(document.querySelectorAll('a'));
-                    
-                    // Filter for car detail links with valid structure
-                    const carLinks = allLinks.filter(link => {
-                        const href = link.href || '';
-                        if (href.includes('/auto/private-lease/anwb-private-lease/aanbod/') && 
-                            !href.includes('aanbod=new') &&
-                            !href.includes('begin-bij')) {
-                            
-                            // Additional check: must have at least two path segments after "aanbod"
-                            const parts = href.split('/aanbod/')[1];
-                            return parts && parts.split('/').length >= 1 && parts.includes('/');
-                        }
-                        return false;
-                    });
-                    
-                    // Get unique URLs
-                    return [...new Set(carLinks.map(link => link.href))];
-                }
-                
-                // Find car links in the page
-                return findCarLinks();
-            """)
-
-            # Add JS-discovered links
-            for href in js_links:
-                if href not in car_urls:
-                    parts = href.split('/')
-                    if len(parts) >= 7:  # Valid car URL should have enough path segments
-                        car_urls.append(href)
+            # Run the extraction methods, the one that found everything last time first,
+            # and stop as soon as the results count is reached
+            methods = {
+                'dom': self.extract_dom_cards,
+                'network': self.extract_network_cards,
+            }
+            for method in strategy.ordered('extraction_method', list(methods)):
+                methods[method](car_urls, on_car_urls)
+                if len(car_urls) >= total_cars:
+                    strategy.record('extraction_method', method)
+                    break
 
             self.logger.info(f"Extracted {len(car_urls)} unique car URLs")
 
             # If we still don't have enough URLs, try one more method - direct URL construction
-            if len(car_urls) < 190:  # If we have fewer than 190 cars (we want all 199)
+            # (skipped once the results count is reached)
+            if len(car_urls) < min(total_cars, 190):  # If we have fewer than 190 cars (we want all 199)
                 self.logger.warning(f"Only found {len(car_urls)} cars, which is less than expected")
                 
                 # Extract make-model pairs from URLs we already have
@@ -393,19 +553,8 @@ class ANWBFullScraper(scrapy.Spider):
                     # Use regular expressions to find potential make-model pairs in the HTML
                     page_text = self.driver.page_source.lower()
                     
-                    # Common makes to look for
-                    common_makes = [
-                        'audi', 'bmw', 'citroen', 'dacia', 'fiat', 'ford', 'hyundai', 'kia', 
-                        'leapmotor', 'mazda', 'mercedes', 'mg', 'mini', 'mitsubishi', 
-                        'nissan', 'opel', 'peugeot', 'renault', 'seat', 'skoda', 'suzuki', 
-                        'tesla', 'toyota', 'volkswagen', 'volvo', 'byd', 'cupra', 'ds'
-                    ]
-                    
-                    # Find all occurrences of makes in the page
-                    found_makes = []
-                    for make in common_makes:
-                        if make in page_text:
-                            found_makes.append(make)
+                    # Find the makes mentioned in the page, as whole words
+                    found_makes = find_brand_slugs(page_text)
                     
                     self.logger.info(f"Found {len(found_makes)} makes in page text")
                     
@@ -441,34 +590,60 @@ class ANWBFullScraper(scrapy.Spider):
                     
                     self.logger.info(f"Generated {len(new_urls)} additional URLs to try")
                     
+                    # Only keep the guesses that resolve to a car page
+                    if new_urls and self.settings.getbool('DISCOVERY_VALIDATE_GUESSES', True):
+                        validator = GuessValidator(
+                            workers=self.settings.getint('DISCOVERY_VALIDATION_WORKERS', 8),
+                            timeout=self.settings.getfloat('DISCOVERY_VALIDATION_TIMEOUT', 10),
+                            user_agent=self.settings.get('USER_AGENT')
+                        )
+                        new_urls, pruned = validator.validate(new_urls)
+                        self.stats['guesses_pruned'] += len(pruned)
+                        self.logger.info(
+                            f"Validated guessed URLs: {len(new_urls)} resolve, {len(pruned)} pruned"
+                            f" ({validator.soft_404s} answered with the listing)"
+                        )
+                    
                     # Add new URLs to our list
                     car_urls.extend(new_urls)
                 except Exception as e:
                     self.logger.error(f"Error generating additional URLs: {str(e)}")
 
             self.logger.info(f"Final count: {len(car_urls)} unique car URLs")
+            
+            # Keep the debug snapshots only when discovery came up short
+            if not car_urls:
+                self.debug_capture.flush("no car URLs found")
+            elif len(car_urls) < total_cars:
+                self.debug_capture.flush(f"only {len(car_urls)}/{total_cars} car URLs found")
+            self.logger.info(f"Discovery wait stats: {self.waits.summary()}")
+            
+            if self.traffic_meter is not None:
+                self.harvest_network_cards()
+                self.logger.info(f"Discovery traffic: {self.traffic_meter.report()}")
+
+            # Remember the listing API seen in the network log, HTTP discovery pages through it next time
+            if self.network_capture is not None:
+                self.harvest_network_cards()
+                if self.network_capture.endpoint_url:
+                    strategy.record('listing_api', endpoint_template(self.network_capture.endpoint_url))
+                    self.logger.info(f"Learned the listing API: {self.network_capture.endpoint_url}")
 
             # Save the list of URLs for reference
             with open("debug/all_car_urls.json", "w", encoding="utf-8") as f:
                 json.dump(car_urls, f, indent=2)
+            strategy.save()
 
             return car_urls
         
         except Exception as e:
             self.logger.error(f"Error during URL extraction with Selenium: {str(e)}")
+            self.debug_capture.flush(f"error: {str(e)}")
             # Try to extract what we can from the current state
             try:
-                all_links = self.driver.find_elements(By.CSS_SELECTOR, 'a[href*="/auto/private-lease/anwb-private-lease/aanbod/"]')
-                
-                for link in all_links:
-                    try:
-                        href = link.get_attribute('href')
-                        if href and '/auto/private-lease/anwb-private-lease/aanbod/' in href and 'aanbod=new' not in href:
-                            parts = href.split('/')
-                            if len(parts) >= 7 and href not in car_urls:
-                                car_urls.append(href)
-                    except:
-                        continue
+                for card in harvest_cards(self.driver):
+                    if card['product_url'] not in car_urls:
+                        car_urls.append(card['product_url'])
                 
                 if car_urls:
                     self.logger.info(f"Recovered {len(car_urls)} URLs after error")
@@ -480,245 +655,413 @@ class ANWBFullScraper(scrapy.Spider):
             return []
     
     def start_requests(self):
-        """Generate requests for all car detail pages"""
-        if not self.all_car_urls:
-            self.logger.error("No car URLs were found. Please check the Selenium extraction process.")
+        """Start listing discovery, reusing the cached URL set while the listing is unchanged"""
+        if self.settings.getbool('DISCOVERY_CACHE_ENABLED', True):
+            self.discovery_cache = DiscoveryCache(
+                self.settings.get('DISCOVERY_CACHE_PATH', DEFAULT_CACHE_PATH),
+                self.settings.getfloat('DISCOVERY_CACHE_TTL', 6 * 3600)
+            )
+            cached = self.discovery_cache.load()
+            if cached and self.discovery_cache.is_fresh(cached):
+                yield from self.use_cached_discovery(cached, "within TTL")
+                return
+            
+            # Probe the first page of the listing API (the first listing page without
+            # one) before paying for a full discovery, bypassing the HTTP cache so
+            # the probe always sees the live listing
+            if self.listing_api_url():
+                probe_url = api_page_url(self.listing_api_url(), 0, self.settings.getint('LISTING_API_PAGE_SIZE', PAGE_SIZE))
+            else:
+                probe_url = listing_page_url(0)
+            yield scrapy.Request(
+                probe_url,
+                callback=self.parse_probe,
+                errback=self.handle_probe_error,
+                meta={'dont_cache': True, 'allow_offsite': True},
+                dont_filter=True
+            )
             return
         
-        for url in self.all_car_urls:
-            yield scrapy.Request(url, callback=self.parse_car_detail, errback=self.handle_error)
+        yield from self.start_discovery()
     
-    def handle_error(self, failure):
-        """Handle errors for failed requests"""
-        self.logger.warning(f"Request failed: {failure.request.url}")
-        self.stats['failed_extractions'] += 1
+    def start_discovery(self, response=None):
+        """
+        Start listing discovery, either over plain HTTP or through Selenium.
+        
+        Args:
+            response: Already fetched first listing (API) page, reused by HTTP discovery
+        """
+        mode = self.discovery or self.settings.get('DISCOVERY_MODE', 'http')
+        self.logger.info(f"Using '{mode}' listing discovery")
+        
+        if mode == 'selenium':
+            self.start_selenium_discovery()
+            return
+        
+        if mode == 'sharded':
+            self.start_selenium_discovery(self.run_sharded_discovery)
+            return
+        
+        # The listing cards load client-side from a JSON API, page through it when it is known
+        if self.listing_api_url():
+            limit = self.settings.getint('LISTING_API_PAGE_SIZE', PAGE_SIZE)
+            if response is not None:
+                yield from self.parse_api_listing(response, offset=0, limit=limit)
+            else:
+                yield self.api_request(0, limit)
+            return
+        
+        if response is not None:
+            yield from self.parse_listing(response, offset=0)
+            return
+        
+        yield self.listing_request(0)
+    
+    def listing_api_url(self):
+        """URL template of the listing API: the LISTING_API_URL setting, else the endpoint learned by Selenium discovery"""
+        if self.api_template is None:
+            strategy = StrategyCache(self.settings.get('DISCOVERY_STRATEGY_PATH', DEFAULT_STRATEGY_PATH))
+            self.api_template = self.settings.get('LISTING_API_URL') or strategy.last('listing_api') or ''
+        return self.api_template
+    
+    def use_cached_discovery(self, cached, reason):
+        """Schedule the cached car URLs instead of running discovery"""
+        self.used_cached_discovery = True
+        self.logger.info(
+            f"Reusing {len(cached['car_urls'])} cached car URLs "
+            f"({reason}, {self.discovery_cache.age(cached) / 60:.0f} minutes old)"
+        )
+        yield from self.car_requests(cached['car_urls'])
+    
+    def parse_probe(self, response):
+        """Compare the first listing (API) page with the cached fingerprint and discover again if it changed"""
+        if self.listing_api_url():
+            try:
+                payload = json.loads(response.body)
+            except ValueError:
+                payload = None
+            self.listing_fingerprint = api_fingerprint(payload)
+        else:
+            # Without the API the fingerprint is empty, the cards load client-side
+            self.listing_fingerprint = listing_fingerprint(response)
+        cached = self.discovery_cache.load()
+        if cached and self.discovery_cache.matches(cached, self.listing_fingerprint):
+            yield from self.use_cached_discovery(cached, "listing unchanged")
+            return
+        
+        self.logger.info("Listing changed since the cached discovery, discovering again")
+        yield from self.start_discovery(response)
     
-    def parse_car_detail(self, response):
-        """Parse individual car detail pages"""
+    def handle_probe_error(self, failure):
+        """Run a full discovery when the listing probe fails"""
+        self.logger.warning(f"Listing probe failed: {failure.request.url}")
+        yield from self.start_discovery()
+    
+    def start_selenium_discovery(self, run=None):
+        """Run Selenium discovery in a worker thread, streaming car URLs into the crawl as they appear"""
+        if self.selenium_discovery_running:
+            return
+        self.selenium_discovery_running = True
+        
+        # Clean up browsers left behind by runs that crashed
+        reaped = reap_orphaned_drivers(self.settings.get('DRIVER_REGISTRY_DIR', DEFAULT_REGISTRY_DIR))
+        if reaped:
+            self.logger.warning(f"Reaped {reaped} orphaned chrome/chromedriver processes")
+        
+        d = threads.deferToThread(run or self.run_selenium_discovery)
+        d.addCallback(self.selenium_discovery_finished)
+        d.addErrback(self.selenium_discovery_failed)
+    
+    def run_selenium_discovery(self):
+        """
+        Worker thread: start Chrome and click through the listing.
+        
+        Returns:
+            A tuple of (car URLs, listing cards captured from the network)
+        """
+        # Imported here: importing the reactor when the spider module loads
+        # would install the default reactor before Scrapy installs TWISTED_REACTOR
+        from twisted.internet import reactor
+        
+        if self.driver is None:
+            self.start_driver()
+        
         try:
-            self.stats['cars_processed'] += 1
-            
-            # Extract make and model from the URL
-            url_parts = response.url.split('/')
-            make = url_parts[-2].capitalize() if len(url_parts) >= 2 else ""
-            model = url_parts[-1].capitalize() if len(url_parts) >= 1 else ""
-            
-            self.logger.info(f"Processing car {self.stats['cars_processed']}/{len(self.all_car_urls)}: {make} {model}")
-            
-            # Check if this is actually a car page
-            # If we don't find price or car-related content, skip it
-            if not re.search(r'€\s*\d+', response.text) and not any(x in response.text.lower() for x in ['lease', 'auto', 'private']):
-                self.logger.warning(f"Skipping {response.url} - does not appear to be a car page")
+            # Get all car URLs using Selenium - with extra effort to get ALL listings
+            car_urls = self.get_all_car_urls(
+                on_car_urls=lambda urls, cards=None: reactor.callFromThread(self.schedule_car_urls, urls, cards)
+            )
+            # Collected before the release below drops the network capture
+            cards = list(self.network_capture.cards.values()) if self.network_capture is not None else []
+        finally:
+            # The browser is not used by the detail crawl, so don't keep it around
+            self.release_driver()
+        
+        # Let the daemon know how much this run used its browser, so it can recycle it
+        if self.daemon_attached:
+            record_pages(self.pages_loaded, self.settings.get('BROWSER_DAEMON_STATE', DEFAULT_STATE_PATH))
+        
+        return car_urls, cards
+    
+    def run_sharded_discovery(self):
+        """
+        Worker thread: discover car URLs shard by shard on a pool of headless browsers.
+        
+        Returns:
+            A tuple of (car URLs, listing cards of the fallback click loop), the
+            shards' cards are scheduled while they are discovered
+        """
+        from twisted.internet import reactor
+        
+        # Resolve the driver before the pool threads start using it
+        self.chromedriver_path()
+        
+        sharded = ShardedDiscovery(
+            driver_factory=self.create_pool_driver,
+            shards=self.settings.getlist('DISCOVERY_SHARDS') or None,
+            url_template=self.settings.get('DISCOVERY_SHARD_URL_TEMPLATE', DEFAULT_SHARD_URL_TEMPLATE),
+            pool_size=self.settings.getint('DISCOVERY_POOL_SIZE', 4),
+            timeouts=self.settings.getdict('DISCOVERY_WAIT_TIMEOUTS'),
+            logger=self.logger
+        )
+        
+        try:
+            car_urls, total_cars = sharded.discover(
+                on_cards=lambda cards: reactor.callFromThread(
+                    self.schedule_car_urls, [card['product_url'] for card in cards], cards
+                )
+            )
+        finally:
+            sharded.close()
+            self.release_driver()
+        
+        self.logger.info(f"Sharded discovery found {len(car_urls)}/{total_cars or '?'} cars")
+        if total_cars:
+            self.total_cars = total_cars
+        
+        # Shards that don't cover the whole listing are completed with the click loop
+        cards = []
+        if not car_urls or (total_cars and len(car_urls) < total_cars):
+            self.logger.warning("Sharded discovery is incomplete, falling back to the 'Load More' click loop")
+            loop_urls, cards = self.run_selenium_discovery()
+            for url in loop_urls:
+                if url not in car_urls:
+                    car_urls.append(url)
+        
+        return car_urls, cards
+    
+    def selenium_discovery_finished(self, result):
+        """Schedule the final URL set, with the cards collected before the browser was released"""
+        car_urls, cards = result
+        self.selenium_discovery_running = False
+        self.logger.info(f"Found {len(car_urls)} car URLs")
+        
+        if not car_urls and not self.all_car_urls:
+            self.logger.error("No car URLs were found. Please check the Selenium extraction process.")
+            return
+        
+        self.schedule_car_urls(car_urls, cards)
+    
+    def selenium_discovery_failed(self, failure):
+        """Log errors raised by the Selenium discovery thread"""
+        self.selenium_discovery_running = False
+        self.logger.error(f"Selenium discovery failed: {failure.getErrorMessage()}")
+    
+    def schedule_car_urls(self, car_urls, cards=None):
+        """Push detail requests for newly discovered car URLs into the running crawl"""
+        for card in cards or []:
+            self.listing_cards.setdefault(card['product_url'], card)
+        
+        for request in self.car_requests(car_urls):
+            self.crawler.engine.crawl(request)
+    
+    def car_requests(self, car_urls):
+        """Generate detail requests for car URLs that have not been seen yet"""
+        for url in car_urls:
+            if url in self.seen_car_urls:
+                continue
+            self.seen_car_urls.add(url)
+            self.all_car_urls.append(url)
+            self.stats['car_links_found'] += 1
+            meta = {'listing_card': self.listing_cards[url]} if url in self.listing_cards else {}
+            yield scrapy.Request(url, callback=self.parse_car_detail, errback=self.handle_error, meta=meta)
+    
+    def parse_listing(self, response, offset):
+        """Parse a listing page and request its car detail pages and the remaining listing pages"""
+        self.stats['listing_pages'] += 1
+        car_urls = extract_car_urls(response)
+        new_urls = [url for url in car_urls if url not in self.seen_car_urls]
+        
+        self.logger.info(f"Listing page at offset {offset}: {len(car_urls)} cars, {len(new_urls)} new")
+        yield from self.car_requests(new_urls)
+        
+        if offset == 0:
+            if not car_urls:
+                self.logger.warning("No cars found on the first listing page")
+                if self.settings.getbool('DISCOVERY_SELENIUM_FALLBACK', True):
+                    self.logger.info("Falling back to Selenium discovery")
+                    self.start_selenium_discovery()
                 return
             
-            # Extract price - looking for elements with € symbol
-            price_element = response.css('*::text').re_first(r'€\s*(\d+(?:[\.,]\d+)?)')
-            monthly_price = 0.0
-            if price_element:
-                monthly_price = float(price_element.replace('.', '').replace(',', '.'))
-                
-                # Fix for unreasonably low prices
-                if monthly_price < 50:
-                    monthly_price = monthly_price * 10  # Assume it's missing a digit
-                    self.logger.info(f"Fixed low price: {monthly_price}")
-            
-            # Extract lease info - look specifically for the format "based on XX months - Y,YYY km/year"
-            lease_duration = 0  # Initialize with 0 instead of default
-            yearly_kilometers = 0  # Initialize with 0 instead of default
-            
-            # First try to find the exact pattern from the listing page
-            based_on_text = response.css('p:contains("based on")::text, p:contains("gebaseerd op")::text').get()
-            if not based_on_text:
-                # Try a more generic approach
-                based_on_texts = response.css('p::text, span::text').getall()
-                for text in based_on_texts:
-                    if ('months' in text.lower() or 'maanden' in text.lower()) and 'km' in text.lower():
-                        based_on_text = text
-                        break
-            
-            if based_on_text:
-                # Extract months
-                months_match = re.search(r'(\d+)\s*(?:months|month|maanden|maand)', based_on_text.lower())
-                if months_match:
-                    lease_duration = int(months_match.group(1))
-                    self.logger.info(f"Extracted lease duration from listing: {lease_duration} months")
-                
-                # Extract kilometers - look for patterns like "5,000 km/year" or "5.000 km/year"
-                km_match = re.search(r'([\d.,]+)\s*(?:k|km)/(?:year|jaar)', based_on_text.lower())
-                if km_match:
-                    km_text = km_match.group(1).replace('.', '').replace(',', '')
-                    yearly_kilometers = int(km_text)
-                    self.logger.info(f"Extracted yearly kilometers from listing: {yearly_kilometers} km/year")
-            
-            # If we couldn't extract from the specific pattern, fall back to our previous method
-            if lease_duration == 0 or yearly_kilometers == 0:
-                self.logger.info("Using fallback method for lease details")
-                lease_info_elements = response.css('p::text, span::text, div::text').getall()
-                
-                # Only set defaults if we couldn't extract them from the page
-                if lease_duration == 0:
-                    lease_duration = 72  # Default most common value
-                
-                if yearly_kilometers == 0:
-                    yearly_kilometers = 5000  # Default most common value
-                
-                for text in lease_info_elements:
-                    # Try to extract months only if we haven't found it yet
-                    if lease_duration == 72:
-                        months_match = re.search(r'(\d+)\s*(?:months|month|maanden|maand)', text.lower())
-                        if months_match:
-                            lease_duration = int(months_match.group(1))
-                    
-                    # Try to extract kilometers only if we haven't found it yet
-                    if yearly_kilometers == 5000:
-                        km_match = re.search(r'(\d+(?:[\.,]\d+)?)\s*(?:k|km)', text.lower())
-                        if km_match:
-                            km_text = km_match.group(1).replace('.', '').replace(',', '')
-                            km_value = int(km_text)
-                            
-                            # Fix unreasonably low km values
-                            if km_value < 5000:
-                                # Since the default is already 5000, don't replace with a default value
-                                # Just use the value if it's reasonable
-                                if km_value > 500:  # If it's at least somewhat reasonable
-                                    yearly_kilometers = km_value
-                                    self.logger.info(f"Using extracted yearly kilometers: {yearly_kilometers}")
-                            else:
-                                yearly_kilometers = km_value
-            
-            # Extract version/trim
-            version = ""
-            version_selectors = ['li::text', 'div::text', 'span::text']
-            for selector in version_selectors:
-                for text in response.css(selector).getall():
-                    if 'version:' in text.lower() or 'versie:' in text.lower():
-                        version = text.replace('Version:', '').replace('Versie:', '').strip()
-                        break
-                if version:  # If found, break outer loop
-                    break
-            
-            # Extract delivery time
-            delivery_time = ""
-            delivery_selectors = ['li::text', 'div::text', 'span::text']
-            for selector in delivery_selectors:
-                for text in response.css(selector).getall():
-                    if 'levertijd:' in text.lower() or 'delivery:' in text.lower():
-                        delivery_time = text.replace('Levertijd:', '').replace('Delivery:', '').strip()
-                        break
-                if delivery_time:  # If found, break outer loop
-                    break
-            
-            # Extract promotional tags
-            promo_tags = []
-            tag_selectors = [
-                '.promotion-tag::text', 
-                '.discount-tag::text',
-                '[data-test="promotion-tag"]::text',
-                'span:contains("voordeel")::text'
-            ]
-            
-            for selector in tag_selectors:
-                for tag in response.css(selector).getall():
-                    if tag.strip() and tag.strip() not in promo_tags:
-                        promo_tags.append(tag.strip())
-            
-            # If no promo tags found, try a more generic approach
-            if not promo_tags:
-                for text in response.css('*::text').getall():
-                    if 'ledenvoordeel' in text.lower() and text.strip() not in promo_tags:
-                        promo_tags.append('Ledenvoordeel')
-                        break
+            self.total_cars = extract_total(response)
+            if self.total_cars:
+                # The total is known, so all remaining pages can be fetched concurrently
+                self.logger.info(f"Found total of {self.total_cars} cars to extract")
+                for page_offset in listing_offsets(self.total_cars):
+                    yield self.listing_request(page_offset)
+                return
+        elif self.total_cars:
+            # All listing pages were already requested from the first page
+            return
+        
+        # Without a total, keep paging until a page adds no new cars
+        if new_urls:
+            yield self.listing_request(offset + PAGE_SIZE)
+    
+    def listing_request(self, offset):
+        """Build the request for the listing page at the given offset"""
+        # Listing pages change during the day, never serve them from the HTTP cache
+        return scrapy.Request(
+            listing_page_url(offset),
+            callback=self.parse_listing,
+            errback=self.handle_listing_error,
+            cb_kwargs={'offset': offset},
+            meta={'dont_cache': True},
+            dont_filter=offset == 0
+        )
+    
+    def api_request(self, offset, limit):
+        """Build the request for the listing API page at the given offset"""
+        # The API may live outside allowed_domains; every offset is requested once,
+        # so the offsite and duplicate filters are bypassed
+        return scrapy.Request(
+            api_page_url(self.listing_api_url(), offset, limit),
+            callback=self.parse_api_listing,
+            errback=self.handle_api_error,
+            cb_kwargs={'offset': offset, 'limit': limit},
+            meta={'dont_cache': True, 'allow_offsite': True},
+            dont_filter=True
+        )
+    
+    def parse_api_listing(self, response, offset, limit):
+        """Parse a listing API page and request its car detail pages and the remaining API pages"""
+        self.stats['listing_pages'] += 1
+        try:
+            payload = json.loads(response.body)
+        except ValueError:
+            payload = None
+        
+        cards = extract_listing_cards(payload) if payload is not None else []
+        for card in cards:
+            self.listing_cards.setdefault(card['product_url'], card)
+        car_urls = list(dict.fromkeys(card['product_url'] for card in cards))
+        new_urls = [url for url in car_urls if url not in self.seen_car_urls]
+        
+        self.logger.info(f"Listing API page at offset {offset}: {len(car_urls)} cars, {len(new_urls)} new")
+        yield from self.car_requests(new_urls)
+        
+        template = self.listing_api_url()
+        if offset == 0:
+            if not car_urls:
+                self.logger.warning("The listing API returned no cars, falling back to the listing pages")
+                yield self.listing_request(0)
+                return
             
-            # Extract image URLs with better filtering
-            image_urls = []
-            car_brand_in_url = False
-
-            # Use the make (brand) to help filter relevant images
-            make_lower = make.lower()
-
-            # Check all img elements
-            for img in response.css('img::attr(src)').getall():
-                # Must be an absolute URL
-                if not img.startswith('http'):
-                    continue
-                    
-                # Must be an image file or transformation
-                if not ('transform' in img or '.jpg' in img or '.png' in img):
-                    continue
-                    
-                # Exclude common non-car image patterns
-                if any(x in img.lower() for x in ['icon', 'logo', 'banner', 'anwb-fietsverzekeren', 
-                                                'autoverkoopservice', 'wat-je-pech', 'onderweg-app',
-                                                'getty', 'campagnepagina', 'homepage', 'zonnepanelen',
-                                                'energiecontract']):
-                    continue
-                    
-                # Prefer images that contain the car make name or model
-                if make_lower in img.lower() or model.lower().replace('-', '') in img.lower():
-                    car_brand_in_url = True
-                    image_urls.append(img)
-                # Or at least match the general pattern of car images
-                elif model.lower().split('-')[0] in img.lower():
-                    car_brand_in_url = True
-                    image_urls.append(img)
-                # For images that don't explicitly mention the brand, be more selective
-                elif 'transform' in img and any(x in img.lower() for x in ['front', 'back', 'side', 'interior', 'dash']):
-                    image_urls.append(img)
-                # Only include other transform images if we haven't found brand-specific ones yet
-                elif 'transform' in img and not car_brand_in_url and not any(x in img.lower() for x in ['anwb-', 'campagne']):
-                    image_urls.append(img)
-
-            # Limit to a reasonable number - car listings typically have 5-10 images
-            if len(image_urls) > 10:
-                # If we have brand-specific images, prioritize those
-                if car_brand_in_url:
-                    brand_images = [img for img in image_urls if make_lower in img.lower() 
-                                    or model.lower().replace('-', '') in img.lower()
-                                    or model.lower().split('-')[0] in img.lower()]
-                    if brand_images:
-                        image_urls = brand_images[:10]  # Keep up to 10 brand-specific images
-                    else:
-                        image_urls = image_urls[:10]  # Just keep the first 10 if no brand-specific ones
-                else:
-                    image_urls = image_urls[:10]  # Just keep the first 10
-
-            self.logger.info(f"Extracted {len(image_urls)} filtered car images")
+            self.total_cars = extract_api_total(payload)
+            if not is_paged(template):
+                return
             
-            # Create item
-            item = {
-                'make': make,
-                'model': model,
-                'version': version,
-                'monthly_price': monthly_price,
-                'lease_duration_months': lease_duration,
-                'yearly_kilometers': yearly_kilometers,
-                'delivery_time': delivery_time,
-                'promotion_tags': promo_tags,
-                'image_urls': image_urls,
-                'product_url': response.url
-            }
+            # Without a limit parameter the API decides the page size
+            if '{limit}' not in template:
+                limit = len(cards)
             
-            # Create and validate the final item
-            try:
-                lease_offer = LeaseOffer(**item)
-                self.stats['successful_extractions'] += 1
-                yield lease_offer.dict()
-            except Exception as e:
-                self.stats['failed_extractions'] += 1
-                self.logger.error(f"Validation error for {response.url}: {str(e)}")
+            if self.total_cars:
+                # The total is known, so all remaining pages can be fetched concurrently
+                self.logger.info(f"Found total of {self.total_cars} cars to extract")
+                for page_offset in range(limit, self.total_cars, limit):
+                    yield self.api_request(page_offset, limit)
+                return
+        elif self.total_cars:
+            # All API pages were already requested from the first page
+            return
+        
+        # Without a total, keep paging until a page adds no new cars
+        if new_urls and is_paged(template):
+            yield self.api_request(offset + limit, limit)
+    
+    def handle_api_error(self, failure):
+        """Fall back to the listing pages when the first listing API request fails"""
+        self.logger.warning(f"Listing API request failed: {failure.request.url}")
+        if failure.request.cb_kwargs.get('offset') == 0:
+            yield self.listing_request(0)
+    
+    def handle_listing_error(self, failure):
+        """Handle errors for failed listing page requests"""
+        self.logger.warning(f"Listing request failed: {failure.request.url}")
+    
+    def handle_error(self, failure):
+        """Handle errors for failed requests"""
+        self.logger.warning(f"Request failed: {failure.request.url}")
+        self.stats['failed_extractions'] += 1
+    
+    async def parse_car_detail(self, response):
+        """Parse individual car detail pages, in a process pool worker when PARSE_PROCESS_POOL is set"""
+        self.stats['cars_processed'] += 1
         
+        url_parts = response.url.split('/')
+        self.logger.info(f"Processing car {self.stats['cars_processed']}/{len(self.all_car_urls)}: {url_parts[-2]} {url_parts[-1]}")
+        
+        listing_card = response.meta.get('listing_card')
+        try:
+            if self.parse_pool is not None:
+                item = await maybe_deferred_to_future(
+                    self.parse_pool.submit(response.body, response.url, response.encoding, listing_card)
+                )
+            else:
+                item = extract_lease_offer(response.body, response.url, response.encoding, listing_card, self.parser)
         except Exception as e:
             self.stats['failed_extractions'] += 1
             self.logger.error(f"Error processing {response.url}: {str(e)}")
+            return
+        
+        # Check if this is actually a car page
+        if item is None:
+            self.logger.warning(f"Skipping {response.url} - does not appear to be a car page")
+            return
+        
+        # Create and validate the final item
+        try:
+            lease_offer = LeaseOffer(**item)
+            self.stats['successful_extractions'] += 1
+            yield lease_offer.dict()
+        except Exception as e:
+            self.stats['failed_extractions'] += 1
+            self.logger.error(f"Validation error for {response.url}: {str(e)}")
     
     def closed(self, reason):
         """Log final statistics when spider closes"""
-        # Close the Selenium driver
-        if hasattr(self, 'driver'):
-            self.driver.quit()
+        # Close the Selenium driver if discovery did not release it
+        self.release_driver()
+        
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+        
+        # Cache the URL set of a completed discovery for the next runs. A partial set
+        # is not cached: the probe cannot tell it apart, as the listing itself is unchanged
+        if self.discovery_cache is not None and not self.used_cached_discovery \
+                and reason == 'finished' and self.all_car_urls:
+            if self.total_cars and len(self.all_car_urls) >= self.total_cars:
+                self.discovery_cache.save(self.all_car_urls, self.listing_fingerprint)
+                self.logger.info(f"Cached {len(self.all_car_urls)} car URLs in {self.discovery_cache.path}")
+            else:
+                self.logger.warning(
+                    f"Not caching the discovery: {len(self.all_car_urls)}/{self.total_cars or '?'} car URLs found"
+                )
         
         self.logger.info("Spider closed. Final statistics:")
         self.logger.info(f"Car links found: {self.stats['car_links_found']}")
+        self.logger.info(f"Listing pages fetched: {self.stats['listing_pages']}")
+        self.logger.info(f"Guessed URLs pruned: {self.stats['guesses_pruned']}")
         self.logger.info(f"Cars processed: {self.stats['cars_processed']}")
         self.logger.info(f"Successful extractions: {self.stats['successful_extractions']}")
         self.logger.info(f"Failed extractions: {self.stats['failed_extractions']}")
\ No newline at end of file
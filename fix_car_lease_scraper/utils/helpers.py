@@ -0,0 +1,182 @@
+import logging
+import os
+import signal
+from typing import List, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:
+    # Optional: without it the process tree is read from /proc, which only exists on Linux
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+# SIGKILL does not exist on Windows, where os.kill() terminates with any other signal
+KILL_SIGNAL = getattr(signal, 'SIGKILL', signal.SIGTERM)
+
+# Whether the missing process tree support was logged already
+_unsupported_logged = False
+
+def _log_unsupported() -> None:
+    """Warn once that process trees cannot be read on this system."""
+    global _unsupported_logged
+    if not _unsupported_logged:
+        _unsupported_logged = True
+        logger.warning("Cannot read process trees without psutil or /proc, only root processes are handled")
+
+def process_tree_pids(root_pid: int) -> List[int]:
+    """
+    List a process and all of its descendants.
+
+    Uses psutil if it is installed, /proc otherwise. Without either only the
+    root pid is returned.
+
+    Args:
+        root_pid: Process ID of the root process
+
+    Returns:
+        The pids of the process tree, root first
+    """
+    if psutil is not None:
+        try:
+            return [root_pid] + [child.pid for child in psutil.Process(root_pid).children(recursive=True)]
+        except psutil.Error:
+            return [root_pid]
+
+    children = {}
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        _log_unsupported()
+        return [root_pid]
+
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                # The command name may contain spaces, the fields after it don't
+                fields = f.read().rsplit(')', 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+
+    pids = []
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+def process_tree_rss_mb(root_pid: int) -> Optional[float]:
+    """
+    Measure the resident memory of a process tree.
+
+    Args:
+        root_pid: Process ID of the root process
+
+    Returns:
+        The total RSS in MB, or None if it could not be read
+    """
+    if psutil is not None:
+        total = 0
+        found = False
+        for pid in process_tree_pids(root_pid):
+            try:
+                total += psutil.Process(pid).memory_info().rss
+                found = True
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024) if found else None
+
+    total_kb = 0
+    found = False
+
+    for pid in process_tree_pids(root_pid):
+        try:
+            with open(f'/proc/{pid}/status', 'r') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total_kb += int(line.split()[1])
+                        found = True
+                        break
+        except (OSError, ValueError):
+            continue
+
+    return total_kb / 1024 if found else None
+
+def process_name(pid: int) -> Optional[str]:
+    """
+    Get the command name of a running process.
+
+    Args:
+        pid: Process ID
+
+    Returns:
+        The command name, or None if the process does not exist or its
+        name cannot be read on this system
+    """
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).name()
+        except psutil.Error:
+            return None
+
+    try:
+        with open(f'/proc/{pid}/comm', 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def is_process_alive(pid: int) -> bool:
+    """
+    Check whether a process exists.
+
+    Args:
+        pid: Process ID
+
+    Returns:
+        True if the process exists, False otherwise
+    """
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+
+    # On Windows os.kill() with signal 0 terminates the process, so assume it is alive
+    if os.name == 'nt':
+        _log_unsupported()
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def kill_process_tree(root_pid: int, name_fragments: Tuple[str, ...] = ()) -> int:
+    """
+    Kill a process and all of its descendants.
+
+    Args:
+        root_pid: Process ID of the root process
+        name_fragments: Only kill processes whose command name contains one of these
+            (all processes if empty), which guards against reused pids. Processes
+            whose name cannot be read are skipped then.
+
+    Returns:
+        The number of processes killed
+    """
+    killed = 0
+    for pid in reversed(process_tree_pids(root_pid)):
+        name = (process_name(pid) or '').lower()
+        if name_fragments and not any(fragment in name for fragment in name_fragments):
+            continue
+        try:
+            os.kill(pid, KILL_SIGNAL)
+            killed += 1
+        except OSError:
+            # Gone already, not ours, or (on Windows) access denied
+            continue
+    return killed
@@ -0,0 +1,144 @@
+import ast
+import gzip
+import logging
+import os
+import zlib
+from typing import Dict, Iterator, NamedTuple, Optional
+
+try:
+    import brotli
+except ImportError:
+    # Optional: only needed for entries stored with Content-Encoding: br
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Default location of Scrapy's filesystem HTTP cache (HTTPCACHE_DIR)
+DEFAULT_HTTPCACHE_DIR = '.scrapy/httpcache'
+
+class CachedResponse(NamedTuple):
+    """A response read back from Scrapy's filesystem HTTP cache."""
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+    @property
+    def encoding(self) -> str:
+        """The charset of the Content-Type header, utf-8 if there is none."""
+        content_type = self.headers.get('content-type', '')
+        for part in content_type.split(';'):
+            name, _, value = part.strip().partition('=')
+            if name.lower() == 'charset' and value:
+                return value.strip('"\'')
+        return 'utf-8'
+
+def _read_headers(path: str) -> Dict[str, str]:
+    """Read a cached header file into a dict with lowercased names."""
+    headers = {}
+    with open(path, 'rb') as f:
+        for line in f.read().decode('latin-1').splitlines():
+            name, _, value = line.partition(':')
+            if value:
+                headers[name.strip().lower()] = value.strip()
+    return headers
+
+class UnsupportedEncodingError(ValueError):
+    """A cached body uses a Content-Encoding that cannot be decoded here."""
+
+# Unsupported encodings that were logged already, each is only logged once
+_logged_encodings = set()
+
+def _decode_body(body: bytes, content_encoding: str) -> bytes:
+    """
+    Undo the Content-Encoding of a cached body, which is stored as received.
+
+    Raises:
+        UnsupportedEncodingError: If the body is brotli-compressed and brotli is not installed
+    """
+    for encoding in reversed([e.strip().lower() for e in content_encoding.split(',') if e.strip()]):
+        if encoding in ('gzip', 'x-gzip'):
+            body = gzip.decompress(body)
+        elif encoding == 'deflate':
+            try:
+                body = zlib.decompress(body)
+            except zlib.error:
+                body = zlib.decompress(body, -zlib.MAX_WBITS)
+        elif encoding == 'br':
+            if brotli is None:
+                raise UnsupportedEncodingError("brotli is not installed (pip install brotli)")
+            try:
+                body = brotli.decompress(body)
+            except brotli.error as e:
+                raise ValueError(f"corrupt brotli body: {e}")
+    return body
+
+def cache_entries(cache_dir: str = DEFAULT_HTTPCACHE_DIR, spider_name: str = 'anwb_lease') -> Iterator[str]:
+    """
+    List the entry directories of Scrapy's filesystem HTTP cache.
+
+    Args:
+        cache_dir: The HTTPCACHE_DIR
+        spider_name: Spider whose cache to read
+
+    Yields:
+        The entry directories, in a stable order
+    """
+    spider_dir = os.path.join(cache_dir, spider_name)
+    if not os.path.isdir(spider_dir):
+        return
+
+    for prefix in sorted(os.listdir(spider_dir)):
+        prefix_dir = os.path.join(spider_dir, prefix)
+        if not os.path.isdir(prefix_dir):
+            continue
+        for key in sorted(os.listdir(prefix_dir)):
+            yield os.path.join(prefix_dir, key)
+
+def read_cached_response(entry: str, status: Optional[int] = 200) -> Optional[CachedResponse]:
+    """
+    Read one entry of Scrapy's filesystem HTTP cache.
+
+    Args:
+        entry: The entry directory
+        status: Only read a response with this status (any if None)
+
+    Returns:
+        The cached response with its body decompressed, or None if it is
+        unreadable or has another status
+    """
+    try:
+        with open(os.path.join(entry, 'meta'), 'r', encoding='utf-8') as f:
+            meta = ast.literal_eval(f.read())
+        if status is not None and meta.get('status') != status:
+            return None
+        headers = _read_headers(os.path.join(entry, 'response_headers'))
+        with open(os.path.join(entry, 'response_body'), 'rb') as f:
+            body = _decode_body(f.read(), headers.get('content-encoding', ''))
+    except UnsupportedEncodingError as e:
+        if headers['content-encoding'] not in _logged_encodings:
+            _logged_encodings.add(headers['content-encoding'])
+            logger.warning(f"Skipping cached responses encoded with {headers['content-encoding']}: {e}")
+        return None
+    except (OSError, ValueError, SyntaxError, zlib.error, EOFError):
+        return None
+
+    return CachedResponse(meta.get('response_url') or meta['url'], meta.get('status', 200), headers, body)
+
+def iter_cached_responses(cache_dir: str = DEFAULT_HTTPCACHE_DIR, spider_name: str = 'anwb_lease',
+                          status: Optional[int] = 200) -> Iterator[CachedResponse]:
+    """
+    Read the responses stored in Scrapy's filesystem HTTP cache.
+
+    Args:
+        cache_dir: The HTTPCACHE_DIR
+        spider_name: Spider whose cache to read
+        status: Only yield responses with this status (all if None)
+
+    Yields:
+        The cached responses, with their bodies decompressed, in a stable order
+    """
+    for entry in cache_entries(cache_dir, spider_name):
+        cached = read_cached_response(entry, status)
+        if cached is not None:
+            yield cached
@@ -29,6 +29,7 @@ import subprocess
 import logging
 import time
 from datetime import datetime
+from fix_car_lease_scraper.discovery.browser import reap_orphaned_drivers
 
 # Configure logging
 logging.basicConfig(
@@ -82,6 +83,11 @@ def run_scraper():
         logging.error(f"Scraper failed with exit code {e.returncode}")
         if e.stderr:
             logging.error(f"Error output: {e.stderr}")
+        
+        # Kill any browser the crashed run left behind before retrying
+        reaped = reap_orphaned_drivers()
+        if reaped:
+            logging.warning(f"Reaped {reaped} orphaned chrome/chromedriver processes")
             
         # Save the error output to a log file
         with open(f'output/scraper_error_{datetime.now().strftime("%Y%m%d%H%M%S")}.log', 'w', encoding='utf-8') as f:
@@ -0,0 +1,17 @@
+from fix_car_lease_scraper.processors.images import RANK_CAR, ImageClassifier
+
+def test_short_model_term_does_not_hide_transform():
+    # The "t" of "t-cross" must not consume the "t" of "https" or "transform"
+    classifier = ImageClassifier('Volkswagen', 't-cross')
+    url = 'https://merk.anwb.nl/transform/3f1c0e2a/volkswagen-t-cross-front-jpg'
+    assert classifier.score(url) == RANK_CAR
+    assert classifier.rank([url, url]) == [url]
+
+def test_transformed_view_without_car_terms_is_kept():
+    classifier = ImageClassifier('Audi', 'a3')
+    url = 'https://merk.anwb.nl/transform/9b2d/interior-dashboard'
+    assert classifier.rank([url]) == [url]
+
+def test_excluded_images_are_dropped():
+    classifier = ImageClassifier('Volkswagen', 't-cross')
+    assert classifier.rank(['https://merk.anwb.nl/transform/1/anwb-logo.png']) == []